@@ -6,15 +6,19 @@ from .rate_limiter import (
     RateLimitState,
     AdaptiveRateLimiter,
 )
+from .connection_pool import ConnectionPool
 from .cache import (
     CachedSearchResult,
     SearchResultCache,
+    ListingCache,
 )
-from .trade_api import TradeAPIClient
+from .trade_api import TradeAPIClient, Listing, StatIndex
 from .clipboard import ClipboardManager
 from .analytics import PriceAnalytics
 from .persistence import (
     DataStore,
+    AppendOnlyStore,
+    BinaryDataStore,
     PriceHistoryStore,
     ScanHistoryStore,
     PriceLearningStore,
@@ -27,17 +31,24 @@ __all__ = [
     'RateLimitTier',
     'RateLimitState',
     'AdaptiveRateLimiter',
+    # HTTP
+    'ConnectionPool',
     # Caching
     'CachedSearchResult',
     'SearchResultCache',
+    'ListingCache',
     # Trade API
     'TradeAPIClient',
+    'Listing',
+    'StatIndex',
     # Clipboard
     'ClipboardManager',
     # Analytics
     'PriceAnalytics',
     # Persistence
     'DataStore',
+    'AppendOnlyStore',
+    'BinaryDataStore',
     'PriceHistoryStore',
     'ScanHistoryStore',
     'PriceLearningStore',
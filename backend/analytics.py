@@ -9,11 +9,38 @@
 # - Quality-price correlation
 # - Hot modifier pattern detection
 
+import copy
+import heapq
+import sys
 import time
+from bisect import bisect_left
 from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from statistics import fmean
 from typing import Dict, Any, List, Optional, Tuple, Callable
 
 
+# Interned names of the dominant currencies, for identity fast paths.
+# Persistence interns record currencies on load so these hit with "is".
+_EXALTED = sys.intern("exalted")
+_CHAOS = sys.intern("chaos")
+_DIVINE = sys.intern("divine")
+
+# Confidence weight per search tier; other tiers weigh 0.5
+_TIER_W = {0: 1.5, 1: 1.2, 2: 0.9, 3: 0.6}
+
+# Confidence weight per listings count, clamped to 0..10:
+# <=2 -> 0.7, 3-4 -> 1.0, 5-9 -> 1.1, 10+ -> 1.3
+_LISTING_W = (0.7, 0.7, 0.7, 1.0, 1.0, 1.1, 1.1, 1.1, 1.1, 1.1, 1.3)
+
+
+@lru_cache(maxsize=256)
+def _pretty_class(item_class: str) -> str:
+    """Display label for an item class key ("body_armours" -> "Body Armours")"""
+    return item_class.replace("_", " ").title()
+
+
 class PriceAnalytics:
     """
     Analytics engine for price data.
@@ -38,13 +65,67 @@ class PriceAnalytics:
         "ex": 1.0,
     }
 
+    # Tier distribution buckets, in tier_hist slot order
+    TIER_LABELS = ("T1", "T2", "T3", "T4", "T5+")
+
+    # Quality score buckets for correlation (upper edges are inclusive)
+    QUALITY_BUCKET_EDGES = (25, 50, 75)
+    QUALITY_BUCKET_LABELS = ("0-25", "26-50", "51-75", "76-100")
+
+    # Max memoized whole-store results kept between invalidations
+    MAX_CACHED_RESULTS = 8
+
     def __init__(self, logger: Optional[Callable[[str], None]] = None):
         self._logger = logger
+        # Memoized results of whole-store aggregates (see _cached)
+        self._stats_cache: Dict[Tuple, Dict[str, Any]] = {}
+        # Pattern -> display name, patterns repeat across calls
+        self._display_name_cache: Dict[str, str] = {}
 
     def _log(self, message: str) -> None:
         if self._logger:
             self._logger(f"[Analytics] {message}")
 
+    def invalidate_cache(self) -> None:
+        """Drop memoized results. Call whenever the learning data changes."""
+        self._stats_cache.clear()
+
+    def _display_name(self, pattern: str) -> str:
+        """Format a mod pattern for display ("# to Strength" -> "+X to Strength")"""
+        display_name = self._display_name_cache.get(pattern)
+        if display_name is None:
+            display_name = pattern.replace("#", "X")
+            if display_name.startswith(("X ", "X%")):
+                display_name = "+" + display_name
+            self._display_name_cache[pattern] = display_name
+        return display_name
+
+    def _cached(
+        self,
+        name: str,
+        records_by_class: Dict[str, List[Dict[str, Any]]],
+        compute: Callable[[Dict[str, List[Dict[str, Any]]]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Return a memoized aggregate, computing it on first use.
+
+        The key includes per-class record counts as a safety net, but a
+        full class gains a record without changing length, so writers must
+        still call invalidate_cache(). Callers get a deep copy.
+        """
+        key = (name, tuple(
+            (item_class, len(records))
+            for item_class, records in records_by_class.items()
+            if isinstance(records, list)
+        ))
+        result = self._stats_cache.get(key)
+        if result is None:
+            result = compute(records_by_class)
+            if len(self._stats_cache) >= self.MAX_CACHED_RESULTS:
+                self._stats_cache.clear()
+            self._stats_cache[key] = result
+        return copy.deepcopy(result)
+
     # =========================================================================
     # STATISTICAL HELPERS
     # =========================================================================
@@ -52,27 +133,61 @@ class PriceAnalytics:
     @staticmethod
     def normalize_price(price: float, currency: str) -> float:
         """Normalize any currency to exalted equivalent"""
-        currency = (currency or "exalted").lower()
-        ratio = PriceAnalytics.CURRENCY_RATIOS.get(currency, 1.0)
+        if currency is _EXALTED:
+            return price * 1.0
+        if currency is _CHAOS:
+            return price * 0.01
+        if currency is _DIVINE:
+            return price * 0.5
+        ratios = PriceAnalytics.CURRENCY_RATIOS
+        # Canonical (already lowercase) names hit directly without .lower()
+        ratio = ratios.get(currency)
+        if ratio is None:
+            ratio = ratios.get((currency or "exalted").lower(), 1.0)
         return price * ratio
 
+    @classmethod
+    def _normalize_prices_bulk(cls, records: List[Dict[str, Any]]) -> List[float]:
+        """
+        Normalize prices for a whole record list in one pass.
+
+        Same result as calling normalize_price per record, but keeps the
+        ratio table and lookups local instead of paying a method call each.
+        Records stamped with "normalized_price" at ingest are used as-is.
+        """
+        # Seeded with the canonical names; other spellings are resolved once
+        ratio_cache: Dict[Optional[str], float] = dict(cls.CURRENCY_RATIOS)
+        normalized = []
+        for r in records:
+            stored = r.get("normalized_price")
+            if stored is not None:
+                normalized.append(stored)
+                continue
+            currency = r.get("currency")
+            ratio = ratio_cache.get(currency)
+            if ratio is None:
+                ratio = cls.CURRENCY_RATIOS.get((currency or "exalted").lower(), 1.0)
+                ratio_cache[currency] = ratio
+            normalized.append(r.get("price", 0) * ratio)
+        return normalized
+
     @staticmethod
-    def calculate_median(values: List[float]) -> float:
-        """Calculate median of a list of values"""
+    def calculate_median(values: List[float], presorted: bool = False) -> float:
+        """Calculate median of a list of values (presorted=True skips the sort)"""
         if not values:
             return 0.0
-        sorted_vals = sorted(values)
+        sorted_vals = values if presorted else sorted(values)
         n = len(sorted_vals)
         if n % 2 == 1:
             return sorted_vals[n // 2]
         return (sorted_vals[n // 2 - 1] + sorted_vals[n // 2]) / 2
 
     @staticmethod
-    def calculate_percentile(values: List[float], p: float) -> float:
-        """Calculate percentile (0-100) of sorted values"""
+    def calculate_percentile(values: List[float], p: float, presorted: bool = False) -> float:
+        """Calculate percentile (0-100) of values (presorted=True skips the sort)"""
         if not values:
             return 0.0
-        sorted_vals = sorted(values)
+        sorted_vals = values if presorted else sorted(values)
         n = len(sorted_vals)
         idx = (p / 100) * (n - 1)
         lower = int(idx)
@@ -86,33 +201,43 @@ class PriceAnalytics:
         if len(values) < 2:
             return 0.0
         if mean is None:
-            mean = sum(values) / len(values)
-        variance = sum((x - mean) ** 2 for x in values) / len(values)
+            mean = fmean(values)
+        variance = fmean([(x - mean) * (x - mean) for x in values])
         return variance ** 0.5
 
+    @staticmethod
+    def calculate_correlation(xs: List[float], ys: List[float]) -> float:
+        """Pearson correlation of two equal-length lists (0 if undefined)"""
+        n = len(xs)
+        if n < 2:
+            return 0.0
+        mean_x = fmean(xs)
+        mean_y = fmean(ys)
+
+        # Co-moment and both variances fused into one loop
+        sxy = sxx = syy = 0.0
+        for x, y in zip(xs, ys):
+            dx = x - mean_x
+            dy = y - mean_y
+            sxy += dx * dy
+            sxx += dx * dx
+            syy += dy * dy
+
+        if sxx > 0 and syy > 0:
+            return sxy / (sxx ** 0.5 * syy ** 0.5)
+        return 0.0
+
     @staticmethod
     def calculate_confidence_weight(record: Dict[str, Any]) -> float:
         """
         Calculate confidence weight for a record.
         Higher weight = more reliable data point.
         """
-        weight = 1.0
-
-        # Search tier weighting (exact match = highest confidence)
-        search_tier = record.get("search_tier", 3)
-        tier_weights = {0: 1.5, 1: 1.2, 2: 0.9, 3: 0.6}
-        weight *= tier_weights.get(search_tier, 0.5)
-
-        # Listings count weighting (more listings = more confidence)
-        listings = record.get("listings_count", 1)
-        if listings >= 10:
-            weight *= 1.3
-        elif listings >= 5:
-            weight *= 1.1
-        elif listings <= 2:
-            weight *= 0.7
-
-        return weight
+        # Search tier (exact match = highest confidence) times listings count
+        # (more listings = more confidence), both from lookup tables
+        tier_weight = _TIER_W.get(record.get("search_tier", 3), 0.5)
+        listings = int(record.get("listings_count", 1))
+        return tier_weight * _LISTING_W[min(max(listings, 0), 10)]
 
     # =========================================================================
     # PRICE ESTIMATION
@@ -145,17 +270,15 @@ class PriceAnalytics:
         if len(similar) < 3:
             similar = records  # Fall back to all records
 
-        # Normalize prices
-        prices = [
-            self.normalize_price(r.get("price", 0), r.get("currency", "exalted"))
-            for r in similar
-        ]
+        # Normalize prices (sorted once for median and min/max)
+        prices = self._normalize_prices_bulk(similar)
+        prices.sort()
 
         return {
-            "min": min(prices),
-            "max": max(prices),
-            "median": self.calculate_median(prices),
-            "average": sum(prices) / len(prices),
+            "min": prices[0],
+            "max": prices[-1],
+            "median": self.calculate_median(prices, presorted=True),
+            "average": fmean(prices),
             "currency": "exalted",
             "sample_count": len(similar),
             "total_records": len(records)
@@ -178,13 +301,22 @@ class PriceAnalytics:
         if not records_by_class:
             return {"success": False, "error": "No data", "patterns": []}
 
-        pattern_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
-            "prices": [],
-            "weighted_prices": [],
-            "tiers": [],
-            "category": None,
-            "count": 0
-        })
+        # Per-pattern aggregates, one flat mapping per field. A pattern's first
+        # sighting is only buffered in first_seen; most patterns never repeat,
+        # so aggregates are allocated on the second sighting.
+        first_seen: Dict[str, Tuple[float, Any, Optional[str]]] = {}
+        pattern_prices: Dict[str, List[float]] = {}
+        tier_hists: Dict[str, List[int]] = defaultdict(lambda: [0] * 5)  # counts per TIER_LABELS slot
+        tier_sums: Dict[str, int] = defaultdict(int)
+        tier_counts: Dict[str, int] = defaultdict(int)
+        pattern_categories: Dict[str, str] = {}
+
+        def add_tier(pattern: str, tier: Any) -> None:
+            if tier and tier > 0:
+                # T1..T4 map to slots 0..3, everything from T5 up to slot 4
+                tier_hists[pattern][min(int(tier), 5) - 1] += 1
+                tier_sums[pattern] += tier
+                tier_counts[pattern] += 1
 
         total_records = 0
 
@@ -192,40 +324,44 @@ class PriceAnalytics:
             if not isinstance(records, list):
                 continue
 
-            for record in records:
+            prices = self._normalize_prices_bulk(records)
+            for record, price in zip(records, prices):
                 total_records += 1
                 mod_patterns = record.get("mod_patterns", [])
-                price = self.normalize_price(
-                    record.get("price", 0),
-                    record.get("currency", "exalted")
-                )
-                weight = self.calculate_confidence_weight(record)
 
-                for mp in mod_patterns:
-                    pattern = mp.get("pattern", "")
+                if mod_patterns:
+                    observations = [
+                        (mp.get("pattern", ""), mp.get("tier"), mp.get("category"))
+                        for mp in mod_patterns
+                    ]
+                else:
+                    # Fallback for old records without mod_patterns
+                    observations = [
+                        (f"[{cat}]", None, cat)
+                        for cat in record.get("mod_categories") or ()
+                    ]
+
+                for pattern, tier, category in observations:
                     if not pattern:
                         continue
 
-                    pattern_stats[pattern]["prices"].append(price)
-                    pattern_stats[pattern]["weighted_prices"].append((price, weight))
-
-                    tier = mp.get("tier")
-                    if tier is not None:
-                        pattern_stats[pattern]["tiers"].append(tier)
-
-                    if mp.get("category"):
-                        pattern_stats[pattern]["category"] = mp.get("category")
-
-                    pattern_stats[pattern]["count"] += 1
-
-                # Fallback for old records without mod_patterns
-                if not mod_patterns and record.get("mod_categories"):
-                    for cat in record.get("mod_categories", []):
-                        fallback_pattern = f"[{cat}]"
-                        pattern_stats[fallback_pattern]["prices"].append(price)
-                        pattern_stats[fallback_pattern]["weighted_prices"].append((price, weight))
-                        pattern_stats[fallback_pattern]["category"] = cat
-                        pattern_stats[fallback_pattern]["count"] += 1
+                    pattern_price_list = pattern_prices.get(pattern)
+                    if pattern_price_list is None:
+                        first = first_seen.get(pattern)
+                        if first is None:
+                            first_seen[pattern] = (price, tier, category)
+                            continue
+                        # Second sighting: flush the buffered observation
+                        first_price, first_tier, first_category = first
+                        pattern_price_list = pattern_prices[pattern] = [first_price]
+                        add_tier(pattern, first_tier)
+                        if first_category:
+                            pattern_categories[pattern] = first_category
+
+                    pattern_price_list.append(price)
+                    add_tier(pattern, tier)
+                    if category:
+                        pattern_categories[pattern] = category
 
         if total_records < 5:
             return {
@@ -235,53 +371,40 @@ class PriceAnalytics:
             }
 
         hot_patterns = []
-        for pattern, stats in pattern_stats.items():
-            if stats["count"] < 2:
+        # first_seen keeps first-sighting order, which decides ties in the ranking
+        for pattern in first_seen:
+            prices = pattern_prices.get(pattern)
+            if prices is None:
                 continue
 
-            prices = stats["prices"]
-            tiers = [t for t in stats["tiers"] if t and t > 0]
-
-            median_price = self.calculate_median(prices)
-
-            # Tier distribution
-            tier_dist = {"T1": 0, "T2": 0, "T3": 0, "T4": 0, "T5+": 0}
-            for t in tiers:
-                if t == 1:
-                    tier_dist["T1"] += 1
-                elif t == 2:
-                    tier_dist["T2"] += 1
-                elif t == 3:
-                    tier_dist["T3"] += 1
-                elif t == 4:
-                    tier_dist["T4"] += 1
-                else:
-                    tier_dist["T5+"] += 1
+            count = len(prices)
 
-            # Format display name
-            display_name = pattern.replace("#", "X")
-            if display_name.startswith("X ") or display_name.startswith("X%"):
-                display_name = "+" + display_name
+            avg_price = sum(prices) / count
+            prices.sort()
+            median_price = self.calculate_median(prices, presorted=True)
+
+            tier_dist = dict(zip(self.TIER_LABELS, tier_hists.get(pattern, [0] * 5)))
+            tier_count = tier_counts.get(pattern, 0)
 
             hot_patterns.append({
                 "pattern": pattern,
-                "display_name": display_name,
-                "category": stats["category"],
-                "count": stats["count"],
+                "display_name": self._display_name(pattern),
+                "category": pattern_categories.get(pattern),
+                "count": count,
                 "median_price": round(median_price, 1),
-                "avg_price": round(sum(prices) / len(prices), 1),
-                "min_price": round(min(prices), 1),
-                "max_price": round(max(prices), 1),
+                "avg_price": round(avg_price, 1),
+                "min_price": round(prices[0], 1),
+                "max_price": round(prices[-1], 1),
                 "tier_distribution": tier_dist,
-                "avg_tier": round(sum(tiers) / len(tiers), 1) if tiers else None
+                "avg_tier": round(tier_sums[pattern] / tier_count, 1) if tier_count else None
             })
 
-        # Sort by popularity × value
-        hot_patterns.sort(key=lambda x: x["count"] * x["median_price"], reverse=True)
-
+        # Top patterns by popularity × value
         return {
             "success": True,
-            "patterns": hot_patterns[:limit],
+            "patterns": heapq.nlargest(
+                limit, hot_patterns, key=lambda x: x["count"] * x["median_price"]
+            ),
             "total_patterns": len(hot_patterns)
         }
 
@@ -300,7 +423,20 @@ class PriceAnalytics:
         - Hot mod categories
         - Item class statistics
         - Top value items
+
+        Memoized until invalidate_cache() is called.
         """
+        result = self._cached("market_insights", records_by_class, self._compute_market_insights)
+        if result.get("success"):
+            # Stamped per call, not memoized with the aggregate
+            result["last_updated"] = int(time.time())
+        return result
+
+    def _compute_market_insights(
+        self,
+        records_by_class: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Uncached implementation of get_market_insights"""
         if not records_by_class:
             return {"success": False, "error": "No data collected", "total_records": 0}
 
@@ -312,12 +448,9 @@ class PriceAnalytics:
                 "total_records": total_records
             }
 
-        mod_category_stats: Dict[str, Dict] = defaultdict(
-            lambda: {"total_price": 0.0, "count": 0}
-        )
-        item_class_stats: Dict[str, Dict] = defaultdict(
-            lambda: {"total_price": 0.0, "count": 0, "avg_quality": 0.0}
-        )
+        category_totals: Dict[str, float] = defaultdict(float)
+        category_counts: Dict[str, int] = defaultdict(int)
+        class_stats = []
 
         all_records = []
 
@@ -325,72 +458,69 @@ class PriceAnalytics:
             if not isinstance(records, list):
                 continue
 
-            for record in records:
-                price = self.normalize_price(
-                    record.get("price", 0),
-                    record.get("currency", "exalted")
-                )
-                quality = record.get("quality_score", 50)
-                categories = record.get("mod_categories", [])
+            class_label = _pretty_class(item_class)
+            class_total = 0.0
+            class_quality = 0.0
+
+            prices = self._normalize_prices_bulk(records)
+            for record, price in zip(records, prices):
+                get = record.get
+                quality = get("quality_score", 50)
+                categories = get("mod_categories", [])
 
                 # Track item class stats
-                item_class_stats[item_class]["total_price"] += price
-                item_class_stats[item_class]["count"] += 1
-                item_class_stats[item_class]["avg_quality"] += quality
+                class_total += price
+                class_quality += quality
 
                 # Track mod category stats
                 for cat in categories:
-                    mod_category_stats[cat]["total_price"] += price
-                    mod_category_stats[cat]["count"] += 1
-
-                # Collect for top items
-                all_records.append({
-                    "item_class": item_class.replace("_", " ").title(),
-                    "base_type": record.get("base_type", "Unknown"),
-                    "price": record.get("price", 0),
-                    "currency": record.get("currency", "exalted"),
-                    "sort_price": price,
-                    "quality": quality,
-                    "timestamp": record.get("timestamp", 0)
+                    category_totals[cat] += price
+                    category_counts[cat] += 1
+
+                # Collect for top items (output dicts are built for the top 5 only)
+                all_records.append((price, class_label, quality, record))
+
+            # Class stats
+            count = len(records)
+            if count:
+                class_stats.append({
+                    "item_class": class_label,
+                    "avg_price": round(class_total / count, 1),
+                    "avg_quality": round(class_quality / count),
+                    "count": count
                 })
 
         # Calculate hot mods
         hot_mods = []
-        for cat, stats in mod_category_stats.items():
-            if stats["count"] >= 2:
-                avg_price = stats["total_price"] / stats["count"]
+        for cat, count in category_counts.items():
+            if count >= 2:
+                avg_price = category_totals[cat] / count
                 hot_mods.append({
                     "category": cat,
                     "avg_price": round(avg_price, 1),
-                    "count": stats["count"]
-                })
-        hot_mods.sort(key=lambda x: x["avg_price"], reverse=True)
-
-        # Calculate class stats
-        class_stats = []
-        for item_class, stats in item_class_stats.items():
-            if stats["count"] >= 1:
-                avg_price = stats["total_price"] / stats["count"]
-                avg_quality = stats["avg_quality"] / stats["count"]
-                class_stats.append({
-                    "item_class": item_class.replace("_", " ").title(),
-                    "avg_price": round(avg_price, 1),
-                    "avg_quality": round(avg_quality),
-                    "count": stats["count"]
+                    "count": count
                 })
-        class_stats.sort(key=lambda x: x["avg_price"], reverse=True)
-
         # Top items
-        all_records.sort(key=lambda x: x["sort_price"], reverse=True)
-        top_items = all_records[:5]
+        top_items = [
+            {
+                "item_class": class_label,
+                "base_type": record.get("base_type", "Unknown"),
+                "price": record.get("price", 0),
+                "currency": record.get("currency", "exalted"),
+                "sort_price": price,
+                "quality": quality,
+                "timestamp": record.get("timestamp", 0)
+            }
+            for price, class_label, quality, record
+            in heapq.nlargest(5, all_records, key=lambda x: x[0])
+        ]
 
         return {
             "success": True,
             "total_records": total_records,
-            "hot_mods": hot_mods[:10],
-            "item_class_stats": class_stats[:10],
-            "top_items": top_items,
-            "last_updated": int(time.time())
+            "hot_mods": heapq.nlargest(10, hot_mods, key=lambda x: x["avg_price"]),
+            "item_class_stats": heapq.nlargest(10, class_stats, key=lambda x: x["avg_price"]),
+            "top_items": top_items
         }
 
     # =========================================================================
@@ -411,82 +541,77 @@ class PriceAnalytics:
             return {"success": False, "error": "No data", "trends": []}
 
         now = int(time.time())
-        day_seconds = 86400
-        cutoff = now - (days * day_seconds)
-
-        class_daily_prices: Dict[str, Dict[int, List[float]]] = defaultdict(
-            lambda: defaultdict(list)
-        )
-
+        trends = []
         for item_class, records in records_by_class.items():
             if not isinstance(records, list):
                 continue
+            trend = self._class_trend(item_class, records, now, days)
+            if trend:
+                trends.append(trend)
 
-            for record in records:
-                ts = record.get("timestamp", 0)
-                if ts < cutoff:
-                    continue
-
-                price = self.normalize_price(
-                    record.get("price", 0),
-                    record.get("currency", "exalted")
-                )
+        return {
+            "success": True,
+            "trends": heapq.nlargest(10, trends, key=lambda x: abs(x["change_percent"])),
+            "period_days": days
+        }
 
-                day_index = (now - ts) // day_seconds
-                class_daily_prices[item_class][day_index].append(price)
+    def _class_trend(
+        self,
+        item_class: str,
+        records: List[Dict[str, Any]],
+        now: int,
+        days: int
+    ) -> Optional[Dict[str, Any]]:
+        """Daily medians and trend for one item class (None if < 2 days of data)"""
+        day_seconds = 86400
 
-        trends = []
-        for item_class, daily_data in class_daily_prices.items():
-            if not daily_data:
-                continue
+        # One price bucket per day index (0 = last 24h); records outside
+        # [0, days) - too old or timestamped in the future - are skipped
+        daily_data: List[List[float]] = [[] for _ in range(days)]
+        prices = self._normalize_prices_bulk(records)
+        day_indices = [(now - r.get("timestamp", 0)) // day_seconds for r in records]
+        for day_index, price in zip(day_indices, prices):
+            if 0 <= day_index < days:
+                daily_data[day_index].append(price)
+
+        daily_medians = []
+        for day_idx, prices in enumerate(daily_data):
+            if prices:
+                median = self.calculate_median(prices)
+                daily_medians.append({
+                    "day": day_idx,
+                    "median": round(median, 1),
+                    "count": len(prices)
+                })
 
-            daily_medians = []
-            for day_idx in range(days):
-                prices = daily_data.get(day_idx, [])
-                if prices:
-                    median = self.calculate_median(prices)
-                    daily_medians.append({
-                        "day": day_idx,
-                        "median": round(median, 1),
-                        "count": len(prices)
-                    })
-
-            if len(daily_medians) < 2:
-                continue
+        if len(daily_medians) < 2:
+            return None
 
-            # Calculate trend
-            recent_prices = [d["median"] for d in daily_medians if d["day"] <= 2]
-            older_prices = [d["median"] for d in daily_medians if d["day"] > 2]
+        # Calculate trend
+        recent_prices = [d["median"] for d in daily_medians if d["day"] <= 2]
+        older_prices = [d["median"] for d in daily_medians if d["day"] > 2]
 
-            if recent_prices and older_prices:
-                recent_avg = sum(recent_prices) / len(recent_prices)
-                older_avg = sum(older_prices) / len(older_prices)
-                change_percent = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
+        if recent_prices and older_prices:
+            recent_avg = fmean(recent_prices)
+            older_avg = fmean(older_prices)
+            change_percent = ((recent_avg - older_avg) / older_avg * 100) if older_avg > 0 else 0
 
-                if change_percent > 10:
-                    trend_direction = "up"
-                elif change_percent < -10:
-                    trend_direction = "down"
-                else:
-                    trend_direction = "stable"
+            if change_percent > 10:
+                trend_direction = "up"
+            elif change_percent < -10:
+                trend_direction = "down"
             else:
-                change_percent = 0
-                trend_direction = "unknown"
-
-            trends.append({
-                "item_class": item_class.replace("_", " ").title(),
-                "daily_data": daily_medians,
-                "trend": trend_direction,
-                "change_percent": round(change_percent, 1),
-                "current_median": daily_medians[0]["median"] if daily_medians else 0
-            })
-
-        trends.sort(key=lambda x: abs(x["change_percent"]), reverse=True)
+                trend_direction = "stable"
+        else:
+            change_percent = 0
+            trend_direction = "unknown"
 
         return {
-            "success": True,
-            "trends": trends[:10],
-            "period_days": days
+            "item_class": _pretty_class(item_class),
+            "daily_data": daily_medians,
+            "trend": trend_direction,
+            "change_percent": round(change_percent, 1),
+            "current_median": daily_medians[0]["median"]
         }
 
     # =========================================================================
@@ -505,79 +630,46 @@ class PriceAnalytics:
         if not records_by_class:
             return {"success": False, "error": "No data", "correlations": []}
 
-        class_data: Dict[str, List[Dict]] = defaultdict(list)
-
-        for item_class, records in records_by_class.items():
-            if not isinstance(records, list):
-                continue
-
-            for record in records:
-                quality = record.get("quality_score", 0)
-                price = self.normalize_price(
-                    record.get("price", 0),
-                    record.get("currency", "exalted")
-                )
-                class_data[item_class].append({
-                    "quality": quality,
-                    "price": price,
-                    "ilvl": record.get("ilvl"),
-                    "search_tier": record.get("search_tier", 3)
-                })
-
         correlations = []
-        for item_class, data_points in class_data.items():
-            if len(data_points) < 5:
+        for item_class, records in records_by_class.items():
+            # Correlation needs at least 5 samples
+            if not isinstance(records, list) or len(records) < 5:
                 continue
+            correlations.append(self._class_correlation(item_class, records))
 
-            qualities = [d["quality"] for d in data_points]
-            prices = [d["price"] for d in data_points]
-
-            n = len(qualities)
-            mean_q = sum(qualities) / n
-            mean_p = sum(prices) / n
-
-            # Pearson correlation
-            numerator = sum((q - mean_q) * (p - mean_p) for q, p in zip(qualities, prices))
-            denom_q = sum((q - mean_q) ** 2 for q in qualities) ** 0.5
-            denom_p = sum((p - mean_p) ** 2 for p in prices) ** 0.5
-
-            if denom_q > 0 and denom_p > 0:
-                correlation = numerator / (denom_q * denom_p)
-            else:
-                correlation = 0
-
-            # Quality buckets
-            buckets: Dict[str, List[float]] = {
-                "0-25": [], "26-50": [], "51-75": [], "76-100": []
-            }
-            for d in data_points:
-                q = d["quality"]
-                if q <= 25:
-                    buckets["0-25"].append(d["price"])
-                elif q <= 50:
-                    buckets["26-50"].append(d["price"])
-                elif q <= 75:
-                    buckets["51-75"].append(d["price"])
-                else:
-                    buckets["76-100"].append(d["price"])
-
-            bucket_medians = {}
-            for bucket, prices_list in buckets.items():
-                if prices_list:
-                    bucket_medians[bucket] = round(self.calculate_median(prices_list), 1)
-
-            correlations.append({
-                "item_class": item_class.replace("_", " ").title(),
-                "correlation": round(correlation, 2),
-                "sample_size": len(data_points),
-                "bucket_medians": bucket_medians
-            })
+        return {
+            "success": True,
+            "correlations": heapq.nlargest(10, correlations, key=lambda x: abs(x["correlation"]))
+        }
 
-        correlations.sort(key=lambda x: abs(x["correlation"]), reverse=True)
+    def _class_correlation(
+        self,
+        item_class: str,
+        records: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Quality/price correlation and bucket medians for one item class"""
+        qualities = [r.get("quality_score", 0) for r in records]
+        prices = self._normalize_prices_bulk(records)
+
+        correlation = self.calculate_correlation(qualities, prices)
+
+        # Quality buckets (bisect on the upper edges: q <= 25 -> bucket 0, ...)
+        edges = self.QUALITY_BUCKET_EDGES
+        bucket_prices: List[List[float]] = [[] for _ in self.QUALITY_BUCKET_LABELS]
+        for q, price in zip(qualities, prices):
+            bucket_prices[bisect_left(edges, q)].append(price)
+
+        bucket_medians = {
+            label: round(self.calculate_median(prices_list), 1)
+            for label, prices_list in zip(self.QUALITY_BUCKET_LABELS, bucket_prices)
+            if prices_list
+        }
 
         return {
-            "success": True,
-            "correlations": correlations[:10]
+            "item_class": _pretty_class(item_class),
+            "correlation": round(correlation, 2),
+            "sample_size": len(qualities),
+            "bucket_medians": bucket_medians
         }
 
     # =========================================================================
@@ -597,67 +689,67 @@ class PriceAnalytics:
 
         Combines scan history and price history for trend analysis.
         """
-        dynamics = []
+        # One entry per timestamp; scan history is merged first and wins ties
+        merged: Dict[Any, Dict[str, Any]] = {}
+        item_name_lower = item_name.lower()
+        basetype_lower = basetype.lower()
 
         # From scan history
         for record in scan_history or []:
             if rarity == "Unique":
-                if record.get("itemName", "").lower() != item_name.lower():
+                if record.get("itemName", "").lower() != item_name_lower:
                     continue
             else:
-                if record.get("basetype", "").lower() != basetype.lower():
+                if record.get("basetype", "").lower() != basetype_lower:
                     continue
 
+            ts = record.get("timestamp")
+            if ts in merged:
+                continue
+
             price_data = record.get("priceData", {})
-            dynamics.append({
-                "timestamp": record.get("timestamp"),
+            merged[ts] = {
+                "timestamp": ts,
                 "price": price_data.get("medianPrice", 0),
                 "currency": price_data.get("currency", "chaos"),
                 "source": "scan"
-            })
+            }
 
         # From price history
         item_key = f"{rarity}_{item_name}_{basetype}".lower()
         for record in price_history.get(item_key, []):
-            dynamics.append({
-                "timestamp": record.get("timestamp"),
+            ts = record.get("timestamp")
+            if ts in merged:
+                continue
+
+            merged[ts] = {
+                "timestamp": ts,
                 "price": record.get("median_price", 0),
                 "currency": record.get("currency", "chaos"),
                 "source": "history"
-            })
+            }
+
+        dynamics = sorted(merged.values(), key=itemgetter("timestamp"))
 
-        # Remove duplicates
-        seen_timestamps = set()
-        unique_dynamics = []
-        for d in dynamics:
-            ts = d.get("timestamp")
-            if ts not in seen_timestamps:
-                seen_timestamps.add(ts)
-                unique_dynamics.append(d)
-        dynamics = unique_dynamics
-
-        # Sort by timestamp
-        dynamics.sort(key=lambda x: x.get("timestamp", 0))
-
-        # Calculate changes
-        for i in range(len(dynamics)):
-            if i > 0:
-                prev_price = dynamics[i - 1]["price"]
-                curr_price = dynamics[i]["price"]
-
-                if prev_price > 0:
-                    change = curr_price - prev_price
-                    change_percent = (change / prev_price) * 100
-
-                    dynamics[i]["change"] = round(change, 2)
-                    dynamics[i]["changePercent"] = round(change_percent, 1)
-
-                    if change_percent > 5:
-                        dynamics[i]["trend"] = "up"
-                    elif change_percent < -5:
-                        dynamics[i]["trend"] = "down"
-                    else:
-                        dynamics[i]["trend"] = "stable"
+        # Calculate changes between consecutive points
+        for prev, curr in zip(dynamics, dynamics[1:]):
+            prev_price = prev["price"]
+            if prev_price > 0:
+                change = curr["price"] - prev_price
+                change_percent = (change / prev_price) * 100
+
+                if change_percent > 5:
+                    trend = "up"
+                elif change_percent < -5:
+                    trend = "down"
+                else:
+                    trend = "stable"
+
+                curr.update(
+                    change=round(change, 2),
+                    changePercent=round(change_percent, 1),
+                    trend=trend
+                )
 
         # 24h change
         now = int(time.time())
@@ -693,7 +785,14 @@ class PriceAnalytics:
         self,
         records_by_class: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, Any]:
-        """Get summary statistics for learning data"""
+        """Get summary statistics for learning data (memoized until invalidate_cache())"""
+        return self._cached("learning_stats", records_by_class, self._compute_learning_stats)
+
+    def _compute_learning_stats(
+        self,
+        records_by_class: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Uncached implementation of get_learning_stats"""
         if not records_by_class:
             return {
                 "success": True,
@@ -709,18 +808,16 @@ class PriceAnalytics:
             if not isinstance(records, list) or not records:
                 continue
 
-            prices = [
-                self.normalize_price(r.get("price", 0), r.get("currency", "exalted"))
-                for r in records
-            ]
-            median_price = self.calculate_median(prices)
+            prices = self._normalize_prices_bulk(records)
+            prices.sort()
+            median_price = self.calculate_median(prices, presorted=True)
 
             classes[item_class] = {
                 "count": len(records),
-                "avg_price": round(sum(prices) / len(prices), 1) if prices else 0,
+                "avg_price": round(fmean(prices), 1) if prices else 0,
                 "median_price": round(median_price, 1),
-                "min_price": round(min(prices), 1) if prices else 0,
-                "max_price": round(max(prices), 1) if prices else 0
+                "min_price": round(prices[0], 1) if prices else 0,
+                "max_price": round(prices[-1], 1) if prices else 0
             }
 
         return {
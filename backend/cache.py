@@ -1,17 +1,19 @@
 # backend/cache.py
 # Search result cache for Trade API
 
-import hashlib
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
 from dataclasses import dataclass
-from collections import OrderedDict
 
 
 @dataclass
 class CachedSearchResult:
-    """Cached search result with timestamp"""
-    timestamp: float
+    """Cached search result with its expiry time (time.monotonic() clock)"""
+    # No per-instance __dict__; declared by hand rather than slots=True,
+    # which needs Python 3.10
+    __slots__ = ("expires_at", "result")
+
+    expires_at: float
     result: Dict[str, Any]
 
 
@@ -22,12 +24,81 @@ class SearchResultCache:
     Caches by: item base type + rarity + modifier hash
     - Time-based expiration (5 minutes default)
     - LRU eviction (max 100 entries for Steam Deck memory)
+    - Admission filter: only rare/unique items, or items searched with
+      at least min_mod_count mods, are stored
     """
 
-    def __init__(self, max_entries: int = 100, ttl_seconds: int = 300):
+    def __init__(
+        self,
+        max_entries: int = 100,
+        ttl_seconds: int = 300,
+        admission_rarities: Iterable[str] = ("rare", "unique"),
+        min_mod_count: int = 3,
+        negative_ttl_seconds: int = 60,
+        max_negative_entries: int = 256
+    ):
         self.max_entries = max_entries
         self.ttl_seconds = ttl_seconds
-        self.cache: OrderedDict[str, CachedSearchResult] = OrderedDict()
+        self.admission_rarities = frozenset(r.lower() for r in admission_rarities)
+        self.min_mod_count = min_mod_count
+        # Keys are (rarity, item_name, base_type, sorted enabled mod ids), see _make_key.
+        # Plain dict: insertion order is the LRU order, oldest first
+        self.cache: Dict[Tuple, CachedSearchResult] = {}
+        # Secondary indexes for invalidate(): lowercased name / base type -> keys
+        self._by_name: Dict[str, Set[Tuple]] = {}
+        self._by_base: Dict[str, Set[Tuple]] = {}
+        # Negative cache: key -> expiry for recent searches that found nothing
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_negative_entries = max_negative_entries
+        self._negative: Dict[Tuple, float] = {}
+
+    def _remove(self, key: Tuple) -> None:
+        """Delete an entry and drop it from the secondary indexes"""
+        del self.cache[key]
+        for index, field in ((self._by_name, key[1]), (self._by_base, key[2])):
+            keys = index.get(field)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[field]
+
+    @staticmethod
+    def _find_indexed(index: Dict[str, Set[Tuple]], needle: str) -> Set[Tuple]:
+        """Keys whose indexed field contains needle (exact match is a direct hit)"""
+        found = set(index.get(needle, ()))
+        for field, keys in index.items():
+            if field != needle and needle in field:
+                found.update(keys)
+        return found
+
+    @staticmethod
+    def make_mod_key(modifiers: List[Dict]) -> Tuple[str, ...]:
+        """Sorted ids of enabled modifiers; compute once per parsed item and reuse"""
+        return tuple(sorted([str(m.get('id', '')) for m in modifiers if m.get('enabled', True)]))
+
+    def _make_key_precomputed(
+        self,
+        item_name: Optional[str],
+        base_type: Optional[str],
+        rarity: str,
+        mod_key: Tuple[str, ...],
+        normalized: bool = False
+    ) -> Tuple:
+        """
+        Create cache key from search parameters and a make_mod_key() result.
+
+        normalized=True promises rarity, item_name and base_type are already
+        lowercase strings ('' for missing) and skips re-lowering them.
+        """
+        # The dict hashes the tuple itself, no digest needed
+        if normalized:
+            return (rarity, item_name, base_type, mod_key)
+        return (
+            (rarity or '').lower(),
+            (item_name or '').lower(),
+            (base_type or '').lower(),
+            mod_key
+        )
 
     def _make_key(
         self,
@@ -35,19 +106,30 @@ class SearchResultCache:
         base_type: Optional[str],
         rarity: str,
         modifiers: List[Dict]
-    ) -> str:
+    ) -> Tuple:
         """Create cache key from search parameters"""
-        # Sort modifiers for consistent hashing
-        mod_ids = sorted([str(m.get('id', '')) for m in modifiers if m.get('enabled', True)])
-        mod_hash = hashlib.md5(','.join(mod_ids).encode()).hexdigest()[:8]
-
-        key_parts = [
-            rarity or '',
-            item_name or '',
-            base_type or '',
-            mod_hash
-        ]
-        return '|'.join(key_parts).lower()
+        return self._make_key_precomputed(
+            item_name, base_type, rarity, self.make_mod_key(modifiers)
+        )
+
+    def make_key(
+        self,
+        item_name: Optional[str],
+        base_type: Optional[str],
+        rarity: str,
+        modifiers: Optional[List[Dict]] = None,
+        mod_key: Optional[Tuple[str, ...]] = None,
+        normalized: bool = False
+    ) -> Tuple:
+        """
+        Public key builder, for callers that do get_cached() then put_cached().
+
+        Pass mod_key (from make_mod_key) instead of modifiers to skip the sort,
+        and normalized=True if the strings are already lowercased.
+        """
+        if mod_key is None:
+            mod_key = self.make_mod_key(modifiers or [])
+        return self._make_key_precomputed(item_name, base_type, rarity, mod_key, normalized)
 
     def get(
         self,
@@ -57,20 +139,23 @@ class SearchResultCache:
         modifiers: List[Dict]
     ) -> Optional[CachedSearchResult]:
         """Get cached result if valid"""
-        key = self._make_key(item_name, base_type, rarity, modifiers)
+        return self.get_cached(self._make_key(item_name, base_type, rarity, modifiers))
 
+    def get_cached(self, key: Tuple) -> Optional[CachedSearchResult]:
+        """Get cached result by a key from make_key()"""
         if key not in self.cache:
             return None
 
         entry = self.cache[key]
 
         # Check TTL
-        if time.time() - entry.timestamp > self.ttl_seconds:
-            del self.cache[key]
+        if time.monotonic() > entry.expires_at:
+            self._remove(key)
             return None
 
         # Move to end (LRU)
-        self.cache.move_to_end(key)
+        del self.cache[key]
+        self.cache[key] = entry
         return entry
 
     def put(
@@ -82,16 +167,41 @@ class SearchResultCache:
         result: Dict[str, Any]
     ) -> None:
         """Store result in cache"""
-        key = self._make_key(item_name, base_type, rarity, modifiers)
+        self.put_cached(self._make_key(item_name, base_type, rarity, modifiers), result)
+
+    def put_cached(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """Store result under a key from make_key()"""
+        # Admission filter: common low-mod items would only evict useful entries
+        if key[0] not in self.admission_rarities and len(key[3]) < self.min_mod_count:
+            return
 
         # Remove oldest if at capacity
         while len(self.cache) >= self.max_entries:
-            self.cache.popitem(last=False)
+            self._remove(next(iter(self.cache)))
 
         self.cache[key] = CachedSearchResult(
-            timestamp=time.time(),
+            expires_at=time.monotonic() + self.ttl_seconds,
             result=result
         )
+        self._by_name.setdefault(key[1], set()).add(key)
+        self._by_base.setdefault(key[2], set()).add(key)
+
+    def mark_miss(self, key: Tuple) -> None:
+        """Remember that a search for key found no listings"""
+        self._negative.pop(key, None)
+        while len(self._negative) >= self.max_negative_entries:
+            del self._negative[next(iter(self._negative))]
+        self._negative[key] = time.monotonic() + self.negative_ttl_seconds
+
+    def is_known_miss(self, key: Tuple) -> bool:
+        """True if a search for key recently found no listings"""
+        expires_at = self._negative.get(key)
+        if expires_at is None:
+            return False
+        if time.monotonic() > expires_at:
+            del self._negative[key]
+            return False
+        return True
 
     def invalidate(
         self,
@@ -102,29 +212,28 @@ class SearchResultCache:
         if not item_name and not base_type:
             count = len(self.cache)
             self.cache.clear()
+            self._by_name.clear()
+            self._by_base.clear()
+            self._negative.clear()
             return count
 
-        keys_to_remove = []
-        for key in self.cache:
-            parts = key.split('|')
-            if len(parts) >= 3:
-                cached_name = parts[1]
-                cached_base = parts[2]
-                if (item_name and item_name.lower() in cached_name) or \
-                   (base_type and base_type.lower() in cached_base):
-                    keys_to_remove.append(key)
+        keys_to_remove: Set[Tuple] = set()
+        if item_name:
+            keys_to_remove |= self._find_indexed(self._by_name, item_name.lower())
+        if base_type:
+            keys_to_remove |= self._find_indexed(self._by_base, base_type.lower())
 
         for key in keys_to_remove:
-            del self.cache[key]
+            self._remove(key)
 
         return len(keys_to_remove)
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        now = time.time()
+        now = time.monotonic()
         valid_entries = sum(
             1 for entry in self.cache.values()
-            if now - entry.timestamp <= self.ttl_seconds
+            if now <= entry.expires_at
         )
         return {
             "total_entries": len(self.cache),
@@ -132,3 +241,75 @@ class SearchResultCache:
             "max_entries": self.max_entries,
             "ttl_seconds": self.ttl_seconds
         }
+
+
+class ListingCache:
+    """
+    Short-lived cache of fetched listings by listing ID, so hovering the
+    same item again skips the /fetch round-trips.
+
+    Bounded with CLOCK eviction: every entry owns a slot in a ring with a
+    reference bit, set on each hit. When full, the hand sweeps the ring,
+    clearing set bits, and reuses the first slot whose bit was already
+    clear (or whose entry expired). No linked list to maintain per hit.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 60):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at on the time.monotonic() clock, slot, value)
+        self._entries: Dict[str, Tuple[float, int, Any]] = {}
+        self._slots: List[str] = []            # slot -> key
+        self._referenced = bytearray()         # slot -> reference bit
+        self._hand = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, slot, value = entry
+        if time.monotonic() > expires_at:
+            # Left in place; the hand reclaims expired slots first
+            return None
+        self._referenced[slot] = 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key for ttl_seconds"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            slot = entry[1]
+        elif len(self._slots) < self.max_entries:
+            slot = len(self._slots)
+            self._slots.append(key)
+            self._referenced.append(0)
+        else:
+            slot = self._evict()
+            self._slots[slot] = key
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, slot, value)
+
+    def _evict(self) -> int:
+        """Advance the hand to a reusable slot, drop its entry, return the slot"""
+        now = time.monotonic()
+        while True:
+            slot = self._hand
+            self._hand = (slot + 1) % self.max_entries
+            key = self._slots[slot]
+            if self._referenced[slot] and now <= self._entries[key][0]:
+                # Recently used: second chance
+                self._referenced[slot] = 0
+                continue
+            self._referenced[slot] = 0
+            del self._entries[key]
+            return slot
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+        self._slots.clear()
+        self._referenced = bytearray()
+        self._hand = 0
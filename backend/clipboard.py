@@ -5,9 +5,23 @@
 # The `decky` module must be imported inside methods, not at module level.
 
 import asyncio
+import functools
 import os
+import re
 import shutil
-from typing import Dict, Any, Callable, Optional
+import socket
+import struct
+import subprocess
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+# ydotoold (ydotool >= 1.0) reads raw `struct input_event` datagrams:
+# timeval (zeroed), type, code, value
+_INPUT_EVENT = struct.Struct("llHHi")
+_EV_SYN, _EV_KEY, _SYN_REPORT = 0, 1, 0
+_KEY_LEFTCTRL, _KEY_C = 29, 46
+
+# Raw-bytes prefilter: text with none of these anywhere can't be a PoE item
+_POE_ITEM_RE_BYTES = re.compile(rb"Item Class:|Rarity:|--------")
 
 
 class ClipboardManager:
@@ -28,6 +42,19 @@ class ClipboardManager:
         "WAYLAND_DISPLAY": "wayland-1"
     }
 
+    # Time the Decky menu needs to close before keys reach the game (seconds)
+    MENU_CLOSE_DELAY = 0.5
+
+    # Ctrl+C simulators in priority order: (tool, args)
+    COPY_TOOLS = (
+        ("ydotool", ("key", "29:1", "46:1", "46:0", "29:0")),  # Wayland / Steam Deck, Ctrl+C keycodes
+        ("xdotool", ("key", "ctrl+c")),                        # X11 / XWayland
+        ("wtype", ("-M", "ctrl", "-P", "c", "-p", "c", "-m", "ctrl")),  # Wayland native
+    )
+
+    # External tools this manager may run
+    TOOLS = ("wl-paste", "xclip", "xsel", "ydotool", "xdotool", "wtype")
+
     def __init__(self, logger: Optional[Callable[[str], None]] = None):
         """
         Initialize clipboard manager.
@@ -36,19 +63,59 @@ class ClipboardManager:
             logger: Optional logging function (e.g., decky.logger.info)
         """
         self._logger = logger
+        # Tool name -> absolute path (None if not installed), see refresh_tools()
+        self._tool_paths: Dict[str, Optional[str]] = {}
+        self.refresh_tools()
+        # Datagram socket to ydotoold, connected on first use
+        self._ydotool_sock: Optional[socket.socket] = None
+
+        # Fill in Gaming Mode display variables that the plugin process lacks.
+        # Side effect: this updates os.environ for the whole plugin process,
+        # so subprocesses can simply inherit it.
+        for key, value in self.DEFAULT_ENV.items():
+            os.environ.setdefault(key, value)
+
+    def refresh_tools(self) -> None:
+        """Re-resolve tool paths (e.g. after installing xclip while running)"""
+        self._tool_paths = {name: shutil.which(name) for name in self.TOOLS}
+
+    def _tool_cmd(self, name: str, *args: str) -> Optional[List[str]]:
+        """Command line for an installed tool using its absolute path, None if missing"""
+        path = self._tool_paths.get(name)
+        if path is None:
+            return None
+        return [path, *args]
 
     def _log(self, message: str, level: str = "info") -> None:
         """Log a message if logger is available"""
         if self._logger:
             self._logger(f"[Clipboard] {message}")
 
-    def _get_env(self) -> Dict[str, str]:
-        """Get environment variables for subprocess calls"""
-        env = os.environ.copy()
-        for key, value in self.DEFAULT_ENV.items():
-            if key not in env:
-                env[key] = value
-        return env
+    async def _run_simple(
+        self,
+        argv: List[str],
+        stdin_bytes: Optional[bytes] = None,
+        timeout: float = 5.0,
+        capture_output: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a short-lived tool with subprocess.run in a worker thread.
+
+        Cheaper than an asyncio subprocess (no pipe transports or child
+        watcher) for one-shot calls that are never cancelled. Raises
+        FileNotFoundError if the tool is missing and asyncio.TimeoutError
+        on timeout. With capture_output=False the output goes to /dev/null,
+        so tools that fork into the background (xclip) can't hold our pipes open.
+        """
+        output = subprocess.PIPE if capture_output else subprocess.DEVNULL
+        run = functools.partial(
+            subprocess.run, argv,
+            input=stdin_bytes, stdout=output, stderr=output, timeout=timeout
+        )
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, run)
+        except subprocess.TimeoutExpired:
+            raise asyncio.TimeoutError(f"{os.path.basename(argv[0])} timed out")
 
     # =========================================================================
     # ITEM VALIDATION
@@ -66,14 +133,15 @@ class ClipboardManager:
         if not text:
             return False
 
-        lines = text.strip().split("\n")
-        if len(lines) < 3:
-            return False
+        # PoE writes the header fields with stable casing near the top, so
+        # bounded exact searches replace split/join/lower
+        head = text[:512]
+        if head.strip().count("\n") < 2:
+            return False  # need at least 3 lines
 
-        first_lines = "\n".join(lines[:5]).lower()
         return (
-            "item class:" in first_lines or
-            "rarity:" in first_lines or
+            "Item Class:" in head or
+            "Rarity:" in head or
             "--------" in text
         )
 
@@ -81,77 +149,116 @@ class ClipboardManager:
     # READ OPERATIONS
     # =========================================================================
 
+    async def _read_with(self, tool_cmd: List[str]) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Read clipboard with one tool.
+
+        Returns:
+            (raw bytes, None) on success, (None, error) on failure,
+            (None, None) if the tool is not installed
+        """
+        tool_name = os.path.basename(tool_cmd[0])
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *tool_cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            self._log(f"{tool_name} not found")
+            return None, None
+        except Exception as e:
+            self._log(f"Error with {tool_name}: {e}")
+            return None, str(e)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=5.0)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # Timed out, or another tool already answered
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._log(f"Timeout with {tool_name}")
+            return None, "Clipboard read timed out"
+
+        if proc.returncode == 0:
+            return stdout, None
+
+        stderr_text = stderr.decode("utf-8", errors="replace").strip()
+        error = stderr_text if stderr_text else f"{tool_name} failed"
+        self._log(f"{tool_name} failed: {error}")
+        return None, error
+
     async def read_clipboard(self) -> Dict[str, Any]:
         """
         Read item text from clipboard using multiple methods.
-        Tries wl-paste, xclip, xsel in order.
+        Runs wl-paste, xclip, xsel concurrently and takes the first PoE item.
+        If no tool returns an item, the earliest tool's text is reported.
 
         Returns:
             {success: bool, text?: str, error?: str}
         """
         self._log("Reading clipboard...")
 
+        # Only installed tools, in priority order
         clipboard_tools = [
-            ["wl-paste", "-n"],
-            ["xclip", "-selection", "clipboard", "-o"],
-            ["xsel", "--clipboard", "--output"],
+            tool_cmd for tool_cmd in (
+                self._tool_cmd("wl-paste", "-n"),
+                self._tool_cmd("xclip", "-selection", "clipboard", "-o"),
+                self._tool_cmd("xsel", "--clipboard", "--output"),
+            ) if tool_cmd
         ]
 
         last_error = "No clipboard tool available"
-        env = self._get_env()
 
-        for tool_cmd in clipboard_tools:
-            try:
-                self._log(f"Trying {tool_cmd[0]}")
-
-                proc = await asyncio.create_subprocess_exec(
-                    *tool_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env
-                )
-
-                try:
-                    stdout, stderr = await asyncio.wait_for(
-                        proc.communicate(),
-                        timeout=5.0
-                    )
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    await proc.wait()
-                    last_error = "Clipboard read timed out"
-                    self._log(f"Timeout with {tool_cmd[0]}")
-                    continue
-
-                if proc.returncode == 0:
-                    clipboard_text = stdout.decode("utf-8", errors="replace")
+        # Task -> tool priority (index in clipboard_tools)
+        tasks = {
+            asyncio.ensure_future(self._read_with(tool_cmd)): index
+            for index, tool_cmd in enumerate(clipboard_tools)
+        }
+        pending = set(tasks)
+        # Successful reads that were not PoE items, by tool priority
+        other_texts: Dict[int, bytes] = {}
 
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    raw, error = task.result()
+                    if raw is None:
+                        if error:
+                            last_error = error
+                        continue
+
+                    # Decode only when the bytes prefilter matches
+                    if _POE_ITEM_RE_BYTES.search(raw) is None:
+                        other_texts[tasks[task]] = raw
+                        continue
+
+                    clipboard_text = raw.decode("utf-8", errors="replace")
                     if self.is_poe_item(clipboard_text):
-                        self._log(f"Read PoE item ({len(clipboard_text)} chars)")
+                        tool_name = os.path.basename(clipboard_tools[tasks[task]][0])
+                        self._log(f"Read PoE item ({len(clipboard_text)} chars) via {tool_name}")
                         return {
                             "success": True,
                             "text": clipboard_text,
                             "error": None
                         }
-                    else:
-                        return {
-                            "success": False,
-                            "text": clipboard_text[:100] if clipboard_text else None,
-                            "error": "Clipboard does not contain PoE2 item data. Hover over an item in PoE2 and press Ctrl+C."
-                        }
-                else:
-                    stderr_text = stderr.decode("utf-8", errors="replace").strip()
-                    last_error = stderr_text if stderr_text else f"{tool_cmd[0]} failed"
-                    self._log(f"{tool_cmd[0]} failed: {last_error}")
-                    continue
-
-            except FileNotFoundError:
-                self._log(f"{tool_cmd[0]} not found")
-                continue
-            except Exception as e:
-                last_error = str(e)
-                self._log(f"Error with {tool_cmd[0]}: {e}")
-                continue
+                    other_texts[tasks[task]] = raw
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if other_texts:
+            # 400 bytes always cover the 100-char preview
+            clipboard_text = other_texts[min(other_texts)][:400].decode("utf-8", errors="replace")
+            return {
+                "success": False,
+                "text": clipboard_text[:100] if clipboard_text else None,
+                "error": "Clipboard does not contain PoE2 item data. Hover over an item in PoE2 and press Ctrl+C."
+            }
 
         return {
             "success": False,
@@ -175,17 +282,14 @@ class ClipboardManager:
         """
         self._log(f"Copying to clipboard ({len(text)} chars)")
 
-        try:
-            env = self._get_env()
+        xclip_cmd = self._tool_cmd("xclip", "-selection", "clipboard")
+        if xclip_cmd is None:
+            return {"success": False, "error": "xclip not found. Install: sudo pacman -S xclip"}
 
-            proc = await asyncio.create_subprocess_exec(
-                "xclip", "-selection", "clipboard",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
+        try:
+            proc = await self._run_simple(
+                xclip_cmd, stdin_bytes=text.encode("utf-8"), capture_output=False
             )
-            await proc.communicate(input=text.encode("utf-8"))
 
             if proc.returncode == 0:
                 return {"success": True}
@@ -201,88 +305,96 @@ class ClipboardManager:
     # KEYBOARD SIMULATION
     # =========================================================================
 
-    async def simulate_copy(self) -> Dict[str, Any]:
-        """
-        Simulate Ctrl+C keypress to copy item from game.
-        Tries ydotool (Wayland), xdotool (X11), wtype (Wayland native) in order.
+    def _ydotool_socket(self) -> Optional[socket.socket]:
+        """Connect to the ydotoold socket, None if the daemon isn't running"""
+        if self._ydotool_sock is not None:
+            return self._ydotool_sock
 
-        Returns:
-            {success: bool, method?: str, error?: str}
+        candidates = [
+            os.environ.get("YDOTOOL_SOCKET"),
+            os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/run/user/1000"), ".ydotool_socket"),
+            "/tmp/.ydotool_socket",
+        ]
+        for path in candidates:
+            if not path or not os.path.exists(path):
+                continue
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.connect(path)
+            except OSError as e:
+                sock.close()
+                self._log(f"ydotoold socket {path} unusable: {e}")
+                continue
+            self._ydotool_sock = sock
+            return sock
+        return None
+
+    async def _ydotool_keys(self, keys: List[Tuple[int, int]]) -> bool:
         """
-        self._log("Simulating Ctrl+C")
-        env = self._get_env()
+        Send (keycode, pressed) events straight to ydotoold, without
+        spawning the ydotool client. Returns False if the daemon is unreachable.
+        """
+        sock = self._ydotool_socket()
+        if sock is None:
+            return False
 
-        # Try ydotool (Wayland / Steam Deck)
         try:
-            self._log("Trying ydotool")
-            proc = await asyncio.create_subprocess_exec(
-                "ydotool", "key", "29:1", "46:1", "46:0", "29:0",  # Ctrl+C keycodes
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=3.0)
+            for code, value in keys:
+                sock.send(_INPUT_EVENT.pack(0, 0, _EV_KEY, code, value))
+                sock.send(_INPUT_EVENT.pack(0, 0, _EV_SYN, _SYN_REPORT, 0))
+                await asyncio.sleep(0.012)  # ydotool's default key delay
+            return True
+        except OSError as e:
+            self._log(f"ydotoold socket error: {e}")
+            sock.close()
+            self._ydotool_sock = None
+            return False
 
-            if proc.returncode == 0:
-                await asyncio.sleep(0.2)  # Wait for clipboard update
-                self._log("ydotool successful")
-                return {"success": True, "method": "ydotool"}
-            else:
-                self._log(f"ydotool failed: {stderr.decode()}")
+    async def _try_tool(self, cmd: List[str], timeout: float) -> Tuple[bool, Optional[str]]:
+        """Run a keyboard tool once. Returns (ok, error description)"""
+        try:
+            proc = await self._run_simple(cmd, timeout=timeout)
         except FileNotFoundError:
-            self._log("ydotool not found")
+            return False, "not found"
         except asyncio.TimeoutError:
-            self._log("ydotool timed out")
+            return False, "timed out"
         except Exception as e:
-            self._log(f"ydotool error: {e}")
+            return False, f"error: {e}"
 
-        # Try xdotool (X11 / XWayland)
-        try:
-            self._log("Trying xdotool")
-            proc = await asyncio.create_subprocess_exec(
-                "xdotool", "key", "ctrl+c",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=3.0)
+        if proc.returncode == 0:
+            return True, None
+        return False, f"failed: {proc.stderr.decode()}"
 
-            if proc.returncode == 0:
-                await asyncio.sleep(0.2)
-                self._log("xdotool successful")
-                return {"success": True, "method": "xdotool"}
-            else:
-                self._log(f"xdotool failed: {stderr.decode()}")
-        except FileNotFoundError:
-            self._log("xdotool not found")
-        except asyncio.TimeoutError:
-            self._log("xdotool timed out")
-        except Exception as e:
-            self._log(f"xdotool error: {e}")
+    async def simulate_copy(self) -> Dict[str, Any]:
+        """
+        Simulate Ctrl+C keypress to copy item from game.
+        Tries ydotool (Wayland), xdotool (X11), wtype (Wayland native) in order.
 
-        # Try wtype (Wayland native)
-        try:
-            self._log("Trying wtype")
-            proc = await asyncio.create_subprocess_exec(
-                "wtype", "-M", "ctrl", "-P", "c", "-p", "c", "-m", "ctrl",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=3.0)
+        Returns:
+            {success: bool, method?: str, error?: str}
+        """
+        self._log("Simulating Ctrl+C")
 
-            if proc.returncode == 0:
-                await asyncio.sleep(0.2)
-                self._log("wtype successful")
-                return {"success": True, "method": "wtype"}
-            else:
-                self._log(f"wtype failed: {stderr.decode()}")
-        except FileNotFoundError:
-            self._log("wtype not found")
-        except asyncio.TimeoutError:
-            self._log("wtype timed out")
-        except Exception as e:
-            self._log(f"wtype error: {e}")
+        # Fast path: talk to a running ydotoold directly
+        ctrl_c = [(_KEY_LEFTCTRL, 1), (_KEY_C, 1), (_KEY_C, 0), (_KEY_LEFTCTRL, 0)]
+        if await self._ydotool_keys(ctrl_c):
+            await asyncio.sleep(0.2)  # Wait for clipboard update
+            self._log("ydotoold socket successful")
+            return {"success": True, "method": "ydotool"}
+
+        for name, args in self.COPY_TOOLS:
+            cmd = self._tool_cmd(name, *args)
+            if cmd is None:
+                self._log(f"{name} not found")
+                continue
+
+            self._log(f"Trying {name}")
+            ok, error = await self._try_tool(cmd, timeout=3.0)
+            if ok:
+                await asyncio.sleep(0.2)  # Wait for clipboard update
+                self._log(f"{name} successful")
+                return {"success": True, "method": name}
+            self._log(f"{name} {error}")
 
         return {
             "success": False,
@@ -308,60 +420,40 @@ class ClipboardManager:
             {success: bool, error?: str}
         """
         self._log(f"Pasting to game chat: {text[:50]}...")
-        env = self._get_env()
+        # The menu starts closing when the user taps paste, so the clipboard
+        # copy below counts toward the menu-close wait
+        loop = asyncio.get_running_loop()
+        menu_closed_at = loop.time() + self.MENU_CLOSE_DELAY
+        # Absolute paths when installed; bare names still raise FileNotFoundError below
+        xclip = self._tool_paths.get("xclip") or "xclip"
+        xdotool = self._tool_paths.get("xdotool") or "xdotool"
 
         try:
             # Step 1: Copy to clipboard
-            proc = await asyncio.create_subprocess_exec(
-                "xclip", "-selection", "clipboard",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
+            proc = await self._run_simple(
+                [xclip, "-selection", "clipboard"],
+                stdin_bytes=text.encode("utf-8"),
+                capture_output=False
             )
-            await proc.communicate(input=text.encode("utf-8"))
 
             if proc.returncode != 0:
                 return {"success": False, "error": "Failed to copy to clipboard"}
 
             self._log("Text copied to clipboard")
 
-            # Step 2: Wait for Decky menu to close
-            await asyncio.sleep(0.5)
-
-            # Step 3: Open chat (Enter)
-            proc = await asyncio.create_subprocess_exec(
-                "xdotool", "key", "Return",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            await asyncio.wait_for(proc.communicate(), timeout=3.0)
-            self._log("Sent Enter to open chat")
-
-            await asyncio.sleep(0.1)
-
-            # Step 4: Paste (Ctrl+V)
-            proc = await asyncio.create_subprocess_exec(
-                "xdotool", "key", "ctrl+v",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
-            )
-            await asyncio.wait_for(proc.communicate(), timeout=3.0)
-            self._log("Sent Ctrl+V to paste")
+            # Step 2: Wait for Decky menu to close (only what's left of the delay)
+            remaining = menu_closed_at - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
 
-            # Step 5: Optionally send (Enter)
+            # Steps 3-5: Enter (open chat), Ctrl+V (paste), optional Enter (send),
+            # chained in one xdotool run so X11 is connected to only once
+            key_chain = [xdotool, "key", "Return", "sleep", "0.1", "key", "ctrl+v"]
             if send:
-                await asyncio.sleep(0.1)
-                proc = await asyncio.create_subprocess_exec(
-                    "xdotool", "key", "Return",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env
-                )
-                await asyncio.wait_for(proc.communicate(), timeout=3.0)
-                self._log("Sent Enter to send message")
+                key_chain += ["sleep", "0.1", "key", "Return"]
+
+            await self._run_simple(key_chain, timeout=3.0)
+            self._log("Sent Enter + Ctrl+V" + (" + Enter to send message" if send else " to paste"))
 
             return {"success": True}
 
@@ -378,14 +470,11 @@ class ClipboardManager:
     # =========================================================================
 
     def get_available_tools(self) -> Dict[str, bool]:
-        """Check which clipboard/keyboard tools are available"""
+        """Check which clipboard/keyboard tools are available (re-resolves paths)"""
+        self.refresh_tools()
         return {
-            "wl_paste": shutil.which("wl-paste") is not None,
-            "xclip": shutil.which("xclip") is not None,
-            "xsel": shutil.which("xsel") is not None,
-            "xdotool": shutil.which("xdotool") is not None,
-            "ydotool": shutil.which("ydotool") is not None,
-            "wtype": shutil.which("wtype") is not None,
+            name.replace("-", "_"): path is not None
+            for name, path in self._tool_paths.items()
         }
 
     def get_environment_info(self) -> Dict[str, str]:
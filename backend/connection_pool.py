@@ -0,0 +1,184 @@
+# backend/connection_pool.py
+# Keep-alive HTTPS connection pool shared by all API requests
+
+import asyncio
+import http.client
+import io
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Optional, Dict, List, NamedTuple, Tuple
+
+
+class Response(NamedTuple):
+    """Fully read HTTP response"""
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+    # Seconds from sending the request to receiving the response headers
+    elapsed: float
+
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections by host, shared by the executor threads.
+
+    Repeat requests to the same API skip the DNS lookup and TLS handshake.
+    Requests are blocking and meant to run in an executor; warm_connections()
+    is the only method that must be called from the event loop.
+    """
+
+    # Idle connections kept per host; also caps how many warm_connections()
+    # opens ahead of a burst
+    MAX_IDLE_PER_HOST = 8
+    MAX_REDIRECTS = 5
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None):
+        self.ssl_context = ssl_context
+        self._idle: Dict[str, List[http.client.HTTPSConnection]] = {}
+        self._warming: Dict[str, int] = {}  # connections being opened by warm_connections()
+        self._lock = threading.Lock()
+
+    def _connect(self, host: str, timeout: float) -> http.client.HTTPSConnection:
+        return http.client.HTTPSConnection(host, timeout=timeout, context=self.ssl_context)
+
+    def checkout(self, host: str, timeout: float, fresh: bool = False) -> Tuple[http.client.HTTPSConnection, bool]:
+        """Take an idle connection to host, or open a new one. Returns (conn, reused)."""
+        if not fresh:
+            with self._lock:
+                idle = self._idle.get(host)
+                conn = idle.pop() if idle else None
+            if conn is not None:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        return self._connect(host, timeout), False
+
+    def checkin(self, host: str, conn: http.client.HTTPSConnection) -> None:
+        """Return a connection to the idle pool"""
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _open_idle(self, host: str, timeout: float) -> None:
+        """Connect (TCP + TLS) a new connection and park it in the idle pool"""
+        conn = self._connect(host, timeout)
+        try:
+            conn.connect()
+        except Exception:
+            # Not fatal: the request that needed it opens its own
+            conn.close()
+        else:
+            self.checkin(host, conn)
+        finally:
+            with self._lock:
+                self._warming[host] -= 1
+
+    def warm_connections(self, host: str, count: int, timeout: float = 15) -> None:
+        """
+        Start opening connections to host in the background until `count`
+        are idle or on their way. Handshakes then overlap the rate-limit
+        waits instead of each concurrent request paying its own.
+        """
+        count = min(count, self.MAX_IDLE_PER_HOST)
+        with self._lock:
+            missing = count - len(self._idle.get(host, ())) - self._warming.get(host, 0)
+            if missing <= 0:
+                return
+            self._warming[host] = self._warming.get(host, 0) + missing
+
+        loop = asyncio.get_running_loop()
+        for _ in range(missing):
+            loop.run_in_executor(None, self._open_idle, host, timeout)
+
+    def request(
+        self,
+        method: str,
+        host: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float
+    ) -> Response:
+        """Blocking request over a pooled connection; error statuses are returned, not raised"""
+        conn, reused = self.checkout(host, timeout)
+        while True:
+            try:
+                started = time.monotonic()
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                elapsed = time.monotonic() - started
+                data = response.read()
+            except ConnectionError:
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a new one
+                conn, reused = self.checkout(host, timeout, fresh=True)
+                continue
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self.checkin(host, conn)
+            return Response(response.status, response.headers, data, elapsed)
+
+    def get(self, url: str, headers: Dict[str, str], timeout: float) -> Response:
+        """
+        GET url (blocking). Follows redirects and raises
+        urllib.error.HTTPError for error statuses, like urlopen; 304 Not
+        Modified is returned rather than raised.
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme != "https":
+                req = urllib.request.Request(url, headers=headers)
+                started = time.monotonic()
+                try:
+                    with urllib.request.urlopen(req, timeout=timeout, context=self.ssl_context) as response:
+                        return Response(response.status, response.headers, response.read(),
+                                        time.monotonic() - started)
+                except urllib.error.HTTPError as e:
+                    if e.code != 304:
+                        raise
+                    return Response(e.code, e.headers, b"", time.monotonic() - started)
+
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            response = self.request("GET", parts.netloc, path, None, headers, timeout)
+
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            raise_for_status(url, response)
+            return response
+
+        raise urllib.error.URLError(f"Too many redirects: {url}")
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for idle in pools:
+            for conn in idle:
+                conn.close()
+
+
+def raise_for_status(url: str, response: Response) -> None:
+    """Raise urllib.error.HTTPError, with the body readable, for an error status"""
+    if response.status >= 400:
+        raise urllib.error.HTTPError(
+            url, response.status, http.client.responses.get(response.status, ""),
+            response.headers, io.BytesIO(response.body)
+        )
@@ -3,15 +3,66 @@
 #
 # Handles file I/O for various data stores:
 # - Settings (settings.json)
-# - Price history (price_history.json)
+# - Price history (price_history.jsonl, append-only log)
 # - Scan history (scan_history.json)
 # - Price learning (price_learning.json)
-# - Stat cache (stat_cache.json)
+# - Stat cache (stat_cache.pickle)
 
+import asyncio
+import atexit
+import io
 import json
 import os
+import pickle
+import sys
+import tempfile
 import time
-from typing import Dict, Any, List, Optional, Callable
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, Iterator, BinaryIO, Set, Tuple
+
+from .analytics import PriceAnalytics
+
+try:
+    import orjson  # C JSON codec, several times faster than stdlib json
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (compact unless pretty)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# All store file writes off the event loop go through this one thread, so
+# they land in the order they were requested
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="datastore-io")
+
+# Live stores, closed by one atexit hook so a pending debounced save isn't
+# lost on interpreter shutdown. Weak, so the hook doesn't keep stores alive.
+_open_stores: "weakref.WeakSet[DataStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_stores() -> None:
+    for store in list(_open_stores):
+        store.close()
+
+
+def _json_loads(buf: bytes) -> Any:
+    """Parse UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
 
 
 class DataStore:
@@ -19,11 +70,28 @@ class DataStore:
     Generic data store with JSON persistence.
 
     Features:
-    - Auto-save on write (optional)
+    - Auto-save on write, coalesced over SAVE_DELAY seconds
     - In-memory caching
     - Versioning for schema migrations
+
+    Files are written as {"_version": N, "data": <payload>}. Older files
+    with "_version" mixed into the payload dict are migrated on first load.
     """
 
+    # Stores whose file is also read/written elsewhere in the old layout
+    # can turn the envelope off
+    ENVELOPE = True
+
+    # Indented output for inspecting files by hand; compact JSON is smaller
+    # and faster to write
+    PRETTY_JSON = False
+
+    # Saves requested within this window are written once
+    SAVE_DELAY = 0.5
+
+    # Directories already created by some store; skips a makedirs per save
+    _ensured_dirs: Set[str] = set()
+
     def __init__(
         self,
         filepath: str,
@@ -37,6 +105,10 @@ class DataStore:
         self._logger = logger
         self._data: Any = None
         self._loaded = False
+        self._dirty = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Future] = None
+        _open_stores.add(self)
 
     def _log(self, message: str) -> None:
         if self._logger:
@@ -49,22 +121,21 @@ class DataStore:
 
         if os.path.exists(self.filepath):
             try:
-                with open(self.filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.filepath, "rb") as f:
+                    data, stored_version, legacy = self._unwrap(self._decode(f.read()))
 
                 # Check version if data has versioning
-                if isinstance(data, dict) and "_version" in data:
-                    stored_version = data.get("_version", 1)
-                    if stored_version < self.version:
-                        self._log(f"Data version {stored_version} < {self.version}, resetting")
-                        self._data = self._init_default()
-                    else:
-                        self._data = data
+                if stored_version is not None and stored_version < self.version:
+                    self._log(f"Data version {stored_version} < {self.version}, resetting")
+                    self._data = self._init_default()
                 else:
                     self._data = data
 
                 self._loaded = True
                 self._log(f"Loaded from {self.filepath}")
+                if legacy:
+                    # Rewrite in the envelope layout
+                    self.save()
                 return self._data
 
             except json.JSONDecodeError as e:
@@ -76,29 +147,183 @@ class DataStore:
         self._loaded = True
         return self._data
 
+    def _encode(self, payload: Any) -> bytes:
+        return _json_dumps(payload, pretty=self.PRETTY_JSON)
+
+    def _decode(self, buf: bytes) -> Any:
+        return _json_loads(buf)
+
+    def _unwrap(self, raw: Any) -> Tuple[Any, Optional[int], bool]:
+        """Split file contents into (payload, stored version, needs migration)"""
+        if (
+            self.ENVELOPE
+            and isinstance(raw, dict)
+            and "data" in raw
+            and all(key.startswith("_") for key in raw if key != "data")
+        ):
+            self._read_envelope(raw)
+            return raw["data"], raw.get("_version", 1), False
+
+        # Old layout: the payload itself, version (if any) mixed into a dict
+        stored_version = raw.get("_version", 1) if isinstance(raw, dict) and "_version" in raw else None
+        if self.ENVELOPE and isinstance(raw, dict):
+            raw.pop("_version", None)
+        return raw, stored_version, self.ENVELOPE
+
+    def _envelope(self) -> Dict[str, Any]:
+        """What gets written to disk; subclasses may add "_"-prefixed metadata"""
+        return {"_version": self.version, "data": self._data}
+
+    def _read_envelope(self, envelope: Dict[str, Any]) -> None:
+        """Pick up metadata written by _envelope()"""
+
     def _init_default(self) -> Any:
         """Initialize with default data"""
-        if isinstance(self.default_data, dict):
+        if isinstance(self.default_data, (dict, list)):
             data = self.default_data.copy()
-            data["_version"] = self.version
+            if not self.ENVELOPE and isinstance(data, dict):
+                data["_version"] = self.version
             return data
         return self.default_data
 
     def save(self) -> bool:
-        """Save data to file"""
+        """
+        Request a save. Inside an event loop the write is deferred by
+        SAVE_DELAY so bursts of mutations cost one serialization; without a
+        running loop it happens immediately.
+        """
+        if self._data is None:
+            return False
+
+        self._dirty = True
+        if self._flush_handle is not None:
+            return True
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._save_now()
+
+        self._flush_handle = loop.call_later(self.SAVE_DELAY, self._scheduled_flush)
+        return True
+
+    def _scheduled_flush(self) -> None:
+        self._flush_handle = None
+        if self._dirty:
+            self._save_task = asyncio.ensure_future(self.asave())
+
+    async def asave(self, fsync: bool = False) -> bool:
+        """
+        Save without blocking the event loop: the data is encoded here (so
+        it can't change mid-serialization) and written on the I/O thread.
+        """
         if self._data is None:
             return False
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
 
         try:
-            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            buf = self._encode(self._payload())
+            # Snapshot taken; later mutations must schedule their own save
+            self._dirty = False
+            await asyncio.get_running_loop().run_in_executor(
+                _IO_EXECUTOR, self._write_file, buf, fsync
+            )
+            self._log(f"Saved to {self.filepath}")
+            return True
 
-            # Add version if dict
-            if isinstance(self._data, dict):
-                self._data["_version"] = self.version
+        except Exception as e:
+            self._dirty = True
+            self._log(f"Save error: {e}")
+            return False
+
+    def flush(self, fsync: bool = False) -> bool:
+        """Write any pending save now"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty:
+            return True
+        return self._save_now(fsync)
+
+    def _ensure_dir(self) -> str:
+        """Create the store's directory once per process and return it"""
+        directory = os.path.dirname(self.filepath)
+        if directory not in DataStore._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            DataStore._ensured_dirs.add(directory)
+        return directory
+
+    def close(self) -> None:
+        """Write any pending save and release open file handles"""
+        self.flush()
+
+    def _write_file(self, buf: bytes, fsync: bool = False) -> None:
+        """
+        Replace filepath with buf atomically: write a temp file in the same
+        directory, then os.replace it over the target. A crash mid-write
+        leaves the previous file intact.
+
+        fsync is off by default; it dominates the cost of small writes and is
+        only worth paying for user-initiated saves.
+        """
+        directory = self._ensure_dir()
+        try:
+            tmp = tempfile.NamedTemporaryFile(
+                mode="wb",
+                buffering=1 << 16,
+                dir=directory,
+                prefix=os.path.basename(self.filepath) + ".",
+                suffix=".tmp",
+                delete=False
+            )
+        except FileNotFoundError:
+            # Directory removed since we created it; recreate on the next save
+            DataStore._ensured_dirs.discard(directory)
+            raise
+        try:
+            with tmp:
+                tmp.write(buf)
+                tmp.flush()
+                if fsync:
+                    os.fsync(tmp.fileno())
+            os.replace(tmp.name, self.filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            raise
 
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2)
+    def _write_ordered(self, buf: bytes, fsync: bool = False) -> None:
+        """Write synchronously, but behind any writes asave() has queued"""
+        try:
+            future = _IO_EXECUTOR.submit(self._write_file, buf, fsync)
+        except RuntimeError:
+            # Executor already shut down at interpreter exit; nothing is queued
+            self._write_file(buf, fsync)
+            return
+        future.result()
+
+    def _payload(self) -> Any:
+        """What gets encoded to the file"""
+        if self.ENVELOPE:
+            return self._envelope()
+        # Add version if dict
+        if isinstance(self._data, dict):
+            self._data["_version"] = self.version
+        return self._data
 
+    def _save_now(self, fsync: bool = False) -> bool:
+        """Save data to file"""
+        if self._data is None:
+            return False
+
+        try:
+            self._write_ordered(self._encode(self._payload()), fsync)
+
+            self._dirty = False
             self._log(f"Saved to {self.filepath}")
             return True
 
@@ -120,18 +345,255 @@ class DataStore:
         self._loaded = True
 
 
-class PriceHistoryStore(DataStore):
-    """Store for price history records"""
+class AppendOnlyStore(DataStore):
+    """
+    Data store backed by a line-delimited JSON log.
+
+    append() writes one line instead of re-encoding the whole store; the log
+    is rewritten from memory (compacted) on save() and after every
+    COMPACT_EVERY appends. Subclasses define how entries rebuild the data.
+
+    The log handle stays open between appends (flushed, not closed, by the
+    debounced save) until a compaction or close().
+    """
+
+    COMPACT_EVERY = 1000
+
+    def __init__(
+        self,
+        filepath: str,
+        default_data: Any = None,
+        version: int = 1,
+        logger: Optional[Callable[[str], None]] = None,
+        legacy_filepath: Optional[str] = None
+    ):
+        super().__init__(filepath, default_data, version, logger)
+        # Plain JSON file from before the log format, migrated on first load
+        self.legacy_filepath = legacy_filepath
+        self._fh: Optional[BinaryIO] = None
+        self._appends = 0
+        self._needs_compact = False
+
+    def _replay(self, entries: Iterator[Any]) -> Any:
+        """Build data from log entries, oldest first"""
+        raise NotImplementedError
+
+    def _entries(self) -> Iterator[Any]:
+        """Log entries that reproduce the current data"""
+        raise NotImplementedError
+
+    def _from_legacy(self, data: Any) -> Any:
+        """Convert the contents of legacy_filepath"""
+        return data
+
+    def _read_entries(self) -> Iterator[Any]:
+        with open(self.filepath, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except ValueError as e:
+                    # A crash mid-append can leave a partial last line
+                    self._log(f"Skipping bad log line: {e}")
+
+    def load(self) -> Any:
+        """Rebuild data from the log, migrating the legacy file if needed"""
+        if self._loaded:
+            return self._data
+
+        if os.path.exists(self.filepath):
+            try:
+                self._data = self._replay(self._read_entries())
+                self._loaded = True
+                self._log(f"Loaded from {self.filepath}")
+                return self._data
+            except Exception as e:
+                self._log(f"Load error: {e}")
+        elif self.legacy_filepath and os.path.exists(self.legacy_filepath):
+            try:
+                with open(self.legacy_filepath, "rb") as f:
+                    self._data = self._from_legacy(_json_loads(f.read()))
+                self._loaded = True
+                self._log(f"Migrating {self.legacy_filepath}")
+                self._needs_compact = True
+                self._save_now()
+                return self._data
+            except Exception as e:
+                self._log(f"Legacy load error: {e}")
+
+        self._data = self._init_default()
+        self._loaded = True
+        return self._data
+
+    def append(self, entry: Any) -> bool:
+        """Log one entry the caller has already applied to data"""
+        try:
+            if self._fh is None:
+                self._ensure_dir()
+                self._fh = open(self.filepath, "ab", buffering=64 * 1024)
+            self._fh.write(_json_dumps(entry) + b"\n")
+        except Exception as e:
+            self._log(f"Append error: {e}")
+            return False
+
+        self._appends += 1
+        if self._appends >= self.COMPACT_EVERY:
+            self._needs_compact = True
+        # Buffered line reaches the disk on the (debounced) flush
+        return super().save()
+
+    def save(self) -> bool:
+        """Request a full rewrite of the log from the in-memory data"""
+        self._needs_compact = True
+        return super().save()
+
+    def _close_log(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def close(self) -> None:
+        super().close()
+        self._close_log()
+
+    async def asave(self, fsync: bool = False) -> bool:
+        # Appends and the log handle live on the loop thread; a compaction
+        # on the I/O thread could race an append into the replaced file.
+        # Flushing appended lines is cheap, so stay synchronous here.
+        return self._save_now(fsync)
+
+    def _save_now(self, fsync: bool = False) -> bool:
+        if self._data is None:
+            return False
+
+        try:
+            if self._needs_compact:
+                self._close_log()
+                self._write_file(
+                    b"".join(_json_dumps(entry) + b"\n" for entry in self._entries()),
+                    fsync
+                )
+                self._needs_compact = False
+                self._appends = 0
+                self._log(f"Compacted {self.filepath}")
+            elif self._fh is not None:
+                self._fh.flush()
+                if fsync:
+                    os.fsync(self._fh.fileno())
+
+            self._dirty = False
+            return True
+
+        except Exception as e:
+            self._log(f"Save error: {e}")
+            return False
+
+
+class _DataUnpickler(pickle.Unpickler):
+    """Unpickler limited to builtin containers and scalars"""
+
+    def find_class(self, module: str, name: str) -> Any:
+        # Plain data never references a global; refusing them means a
+        # tampered file can't make load() call anything
+        raise pickle.UnpicklingError(f"global '{module}.{name}' is forbidden")
+
+
+class BinaryDataStore(DataStore):
+    """
+    Data store serialized with pickle (protocol 5) instead of JSON, for big
+    flat lookup tables where decode time matters. Only builtin containers
+    and scalars are accepted on load.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        default_data: Any = None,
+        version: int = 1,
+        logger: Optional[Callable[[str], None]] = None,
+        legacy_filepath: Optional[str] = None
+    ):
+        super().__init__(filepath, default_data, version, logger)
+        # JSON file this store replaced, imported when filepath doesn't exist yet
+        self.legacy_filepath = legacy_filepath
+
+    def _encode(self, payload: Any) -> bytes:
+        return pickle.dumps(payload, protocol=5)
+
+    def _decode(self, buf: bytes) -> Any:
+        return _DataUnpickler(io.BytesIO(buf)).load()
+
+    def load(self) -> Any:
+        """Load data, importing the legacy JSON file on first run"""
+        if (
+            not self._loaded
+            and self.legacy_filepath
+            and not os.path.exists(self.filepath)
+            and os.path.exists(self.legacy_filepath)
+        ):
+            try:
+                with open(self.legacy_filepath, "rb") as f:
+                    data, _, _ = self._unwrap(_json_loads(f.read()))
+                self._data = data
+                self._loaded = True
+                self._log(f"Migrating {self.legacy_filepath}")
+                self.save()
+                return self._data
+            except Exception as e:
+                self._log(f"Legacy load error: {e}")
+
+        return super().load()
+
+
+class PriceHistoryStore(AppendOnlyStore):
+    """
+    Store for price history records, oldest first per item (the order
+    main.py keeps them in). Log entries are [item_key, record].
+    """
 
     def __init__(self, settings_dir: str, logger: Optional[Callable[[str], None]] = None):
         super().__init__(
-            filepath=os.path.join(settings_dir, "price_history.json"),
+            filepath=os.path.join(settings_dir, "price_history.jsonl"),
             default_data={},
             version=1,
-            logger=logger
+            logger=logger,
+            legacy_filepath=os.path.join(settings_dir, "price_history.json")
         )
         self.max_records_per_item = 100
 
+    def _replay(self, entries: Iterator[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        # Bounded deques drop records that a later compaction would have trimmed
+        per_item: Dict[str, deque] = {}
+        for entry in entries:
+            try:
+                item_key, record = entry
+            except (TypeError, ValueError):
+                continue
+            records = per_item.get(item_key)
+            if records is None:
+                records = per_item[item_key] = deque(maxlen=self.max_records_per_item)
+            records.append(record)
+        return {item_key: list(records) for item_key, records in per_item.items()}
+
+    def _entries(self) -> Iterator[Any]:
+        for item_key, records in self._data.items():
+            if isinstance(records, list):
+                for record in records:
+                    yield [item_key, record]
+
+    def _from_legacy(self, data: Any) -> Dict[str, List[Dict[str, Any]]]:
+        if not isinstance(data, dict):
+            return {}
+        return {
+            key: value for key, value in data.items()
+            if not key.startswith("_") and isinstance(value, list)
+        }
+
+    def append_record(self, item_key: str, record: Dict[str, Any]) -> bool:
+        """Log a record the caller already appended to data[item_key]"""
+        return self.append([item_key, record])
+
     def add_record(
         self,
         item_key: str,
@@ -152,13 +614,14 @@ class PriceHistoryStore(DataStore):
             "listing_count": listing_count
         }
 
-        data[item_key].insert(0, record)
+        records = data[item_key]
+        records.append(record)
 
-        # Trim to max size
-        if len(data[item_key]) > self.max_records_per_item:
-            data[item_key] = data[item_key][:self.max_records_per_item]
+        # Trim to max size, dropping the oldest
+        if len(records) > self.max_records_per_item:
+            del records[:len(records) - self.max_records_per_item]
 
-        return self.save()
+        return self.append_record(item_key, record)
 
     def get_records(self, item_key: str) -> List[Dict[str, Any]]:
         """Get price records for an item"""
@@ -173,6 +636,10 @@ class PriceHistoryStore(DataStore):
 class ScanHistoryStore(DataStore):
     """Store for full scan records with icon caching"""
 
+    # Every scan rewrites the whole file; during a burst of scans write it
+    # at most every 5s (close() on unload writes any pending change)
+    SAVE_DELAY = 5.0
+
     def __init__(
         self,
         settings_dir: str,
@@ -188,45 +655,107 @@ class ScanHistoryStore(DataStore):
         self.settings_dir = settings_dir
         self.icon_cache_dir = os.path.join(settings_dir, "icons")
         self.max_records = max_records
+        # record id -> record, rebuilt lazily when the list is replaced or
+        # changes size behind our back (main.py assigns _data directly)
+        self._id_index: Dict[str, Dict[str, Any]] = {}
+        self._indexed: Optional[List[Dict[str, Any]]] = None
+        self._indexed_len = 0
+        # Record ids come from a counter seeded with the time in ms and
+        # persisted in the file envelope, so they stay unique across restarts
+        self._id_counter = int(time.time() * 1000)
+
+    def _envelope(self) -> Dict[str, Any]:
+        envelope = super()._envelope()
+        envelope["_id_counter"] = self._id_counter
+        return envelope
+
+    def _read_envelope(self, envelope: Dict[str, Any]) -> None:
+        stored = envelope.get("_id_counter")
+        if isinstance(stored, int):
+            self._id_counter = max(self._id_counter, stored)
+
+    def next_id(self) -> str:
+        """Allocate a new record ID"""
+        self._id_counter += 1
+        return f"{self._id_counter:016x}"
+
+    def _get_index(self) -> Dict[str, Dict[str, Any]]:
+        data = self.data
+        if not isinstance(data, list):
+            return {}
+        if data is not self._indexed or len(data) != self._indexed_len:
+            self._id_index = {
+                record["id"]: record for record in data
+                if isinstance(record, dict) and "id" in record
+            }
+            self._indexed = data
+            self._indexed_len = len(data)
+        return self._id_index
 
     def add_record(self, record: Dict[str, Any]) -> str:
-        """Add a scan record and return its ID"""
-        import uuid
-
+        """
+        Add a scan record, newest first, and return its ID. Keeps an "id"
+        already taken from next_id() (e.g. to name the record's icon), and
+        trims to max_records, removing the dropped records' icons.
+        """
         data = self.data
         if not isinstance(data, list):
             data = []
             self._data = data
 
-        # Generate unique ID
-        record_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        record_id = record.get("id") or self.next_id()
         record["id"] = record_id
-        record["timestamp"] = int(time.time())
+        record.setdefault("timestamp", int(time.time()))
+
+        index = self._get_index()
 
         # Add to beginning (newest first)
         data.insert(0, record)
+        index[record_id] = record
 
         # Trim and cleanup old icons
         if len(data) > self.max_records:
             removed = data[self.max_records:]
-            self._data = data[:self.max_records]
+            del data[self.max_records:]
+            for old in removed:
+                index.pop(old.get("id"), None)
             self._cleanup_icons(removed)
 
+        self._indexed = data
+        self._indexed_len = len(data)
+
         self.save()
         return record_id
 
     def _cleanup_icons(self, removed_records: List[Dict[str, Any]]) -> None:
-        """Remove cached icons for removed records"""
-        for record in removed_records:
-            icon_path = record.get("localIconPath")
-            if icon_path:
-                full_path = os.path.join(self.settings_dir, icon_path)
-                try:
-                    if os.path.exists(full_path):
-                        os.remove(full_path)
-                        self._log(f"Removed old icon: {icon_path}")
-                except Exception as e:
-                    self._log(f"Failed to remove icon: {e}")
+        """
+        Remove cached icons for removed records. Inside an event loop the
+        deletions run on a worker thread; nothing waits for them.
+        """
+        icon_paths = [
+            record["localIconPath"] for record in removed_records
+            if record.get("localIconPath")
+        ]
+        if not icon_paths:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._unlink_icons(icon_paths)
+            return
+        loop.run_in_executor(None, self._unlink_icons, icon_paths)
+
+    def _unlink_icons(self, icon_paths: List[str]) -> None:
+        for icon_path in icon_paths:
+            # unlink directly rather than stat first; a missing icon is fine
+            try:
+                os.unlink(os.path.join(self.settings_dir, icon_path))
+                self._log(f"Removed old icon: {icon_path}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self._log(f"Failed to remove icon: {e}")
 
     def get_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get scan records"""
@@ -237,10 +766,7 @@ class ScanHistoryStore(DataStore):
 
     def get_record(self, record_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific record by ID"""
-        for record in self.data or []:
-            if record.get("id") == record_id:
-                return record
-        return None
+        return self._get_index().get(record_id)
 
     def clear(self) -> bool:
         """Clear all history and cached icons"""
@@ -258,11 +784,20 @@ class ScanHistoryStore(DataStore):
         return self.save()
 
 
+@lru_cache(maxsize=256)
+def _class_key(item_class: str) -> str:
+    # Item class names are a small fixed vocabulary, so this stays warm
+    return item_class.lower().replace(" ", "_")
+
+
 class PriceLearningStore(DataStore):
     """Store for price learning data with versioned schema"""
 
     CURRENT_VERSION = 3  # v3 includes defense stats, pdps/edps, implicit patterns
 
+    # Whole-file rewrite per learned price; coalesce like ScanHistoryStore
+    SAVE_DELAY = 5.0
+
     def __init__(
         self,
         settings_dir: str,
@@ -276,11 +811,50 @@ class PriceLearningStore(DataStore):
             logger=logger
         )
         self.max_records_per_class = max_records_per_class
+        # Record count across classes, maintained by add_record; _counted is
+        # the data object it was computed for (main.py may swap _data)
+        self._total_count = 0
+        self._counted: Any = None
+
+    def _recount(self) -> int:
+        data = self.data
+        self._total_count = sum(len(v) for v in data.values() if isinstance(v, list))
+        self._counted = data
+        return self._total_count
+
+    @staticmethod
+    def class_key(item_class: str) -> str:
+        """Storage key for an item class, e.g. "Body Armours" -> "body_armours" """
+        return _class_key(item_class)
+
+    def load(self) -> Any:
+        """Load data, interning currencies and stamping legacy records with normalized_price"""
+        was_loaded = self._loaded
+        data = super().load()
+        if not was_loaded and isinstance(data, dict):
+            self._recount()
+            migrated = 0
+            for records in data.values():
+                if not isinstance(records, list):
+                    continue
+                for record in records:
+                    # Few distinct currencies; interning lets lookups hit by identity
+                    currency = record.get("currency")
+                    if isinstance(currency, str):
+                        record["currency"] = sys.intern(currency)
+                    if "normalized_price" not in record:
+                        record["normalized_price"] = PriceAnalytics.normalize_price(
+                            record.get("price", 0), record.get("currency", "exalted")
+                        )
+                        migrated += 1
+            if migrated:
+                self._log(f"Added normalized_price to {migrated} legacy records")
+        return data
 
     def add_record(self, item_class: str, record: Dict[str, Any]) -> bool:
         """Add a learning record for an item class"""
         data = self.data
-        item_class_key = item_class.lower().replace(" ", "_")
+        item_class_key = _class_key(item_class)
 
         if item_class_key not in data:
             data[item_class_key] = []
@@ -289,56 +863,78 @@ class PriceLearningStore(DataStore):
         if "timestamp" not in record:
             record["timestamp"] = int(time.time())
 
-        data[item_class_key].insert(0, record)
+        currency = record.get("currency")
+        if isinstance(currency, str):
+            record["currency"] = sys.intern(currency)
+
+        # Normalize once at ingest so analytics never has to
+        if "normalized_price" not in record:
+            record["normalized_price"] = PriceAnalytics.normalize_price(
+                record.get("price", 0), record.get("currency", "exalted")
+            )
+
+        if self._counted is not data:
+            self._recount()
 
-        # Trim to max size
-        if len(data[item_class_key]) > self.max_records_per_class:
-            data[item_class_key] = data[item_class_key][:self.max_records_per_class]
+        records = data[item_class_key]
+        records.insert(0, record)
+        self._total_count += 1
+
+        # Trim to max size in place (no copy of the kept records)
+        excess = len(records) - self.max_records_per_class
+        if excess > 0:
+            del records[self.max_records_per_class:]
+            self._total_count -= excess
 
         return self.save()
 
     def get_records(self, item_class: str) -> List[Dict[str, Any]]:
         """Get records for an item class"""
-        item_class_key = item_class.lower().replace(" ", "_")
+        item_class_key = _class_key(item_class)
         return self.data.get(item_class_key, [])
 
     def get_all_records(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get all records grouped by item class"""
         result = {}
         for key, value in self.data.items():
-            if not key.startswith("_") and isinstance(value, list):
+            if isinstance(value, list):
                 result[key] = value
         return result
 
     def get_total_count(self) -> int:
         """Get total number of records across all classes"""
-        return sum(
-            len(v) for v in self.data.values()
-            if isinstance(v, list)
-        )
+        if self._counted is not self.data:
+            return self._recount()
+        return self._total_count
 
 
-class StatCacheStore(DataStore):
+class StatCacheStore(BinaryDataStore):
     """Store for Trade API stat ID cache"""
 
     def __init__(self, settings_dir: str, logger: Optional[Callable[[str], None]] = None):
         super().__init__(
-            filepath=os.path.join(settings_dir, "stat_cache.json"),
+            filepath=os.path.join(settings_dir, "stat_cache.pickle"),
             default_data={"cache": {}, "timestamp": 0, "count": 0},
             version=1,
-            logger=logger
+            logger=logger,
+            legacy_filepath=os.path.join(settings_dir, "stat_cache.json")
         )
 
     def get_cache(self) -> Dict[str, str]:
         """Get the stat ID cache"""
         return self.data.get("cache", {})
 
-    def set_cache(self, cache: Dict[str, str]) -> bool:
+    def get_etag(self) -> Optional[str]:
+        """ETag of the /data/stats response the cache was built from"""
+        return self.data.get("etag")
+
+    def set_cache(self, cache: Dict[str, str], etag: Optional[str] = None) -> bool:
         """Set the stat ID cache"""
         self._data = {
             "cache": cache,
             "timestamp": int(time.time()),
-            "count": len(cache)
+            "count": len(cache),
+            "etag": etag
         }
         return self.save()
 
@@ -348,14 +944,21 @@ class StatCacheStore(DataStore):
 
     def set_stat_id(self, normalized_text: str, stat_id: str) -> None:
         """Set a stat ID mapping"""
-        cache = self.get_cache()
+        # Mutate in place; the debounced save coalesces bursts of new stats
+        data = self.data
+        cache = data.setdefault("cache", {})
         cache[normalized_text] = stat_id
-        self.set_cache(cache)
+        data["count"] = len(cache)
+        data["timestamp"] = int(time.time())
+        self.save()
 
 
 class SettingsStore(DataStore):
     """Store for plugin settings"""
 
+    # settings.json is also read and written directly by main.py as a flat dict
+    ENVELOPE = False
+
     DEFAULT_SETTINGS = {
         "league": "Fate of the Vaal",
         "useTradeApi": True,
@@ -376,13 +979,15 @@ class SettingsStore(DataStore):
         """Get a setting value"""
         return self.data.get(key, default)
 
+    # Settings are user-visible, so they are written immediately and synced
+
     def set(self, key: str, value: Any) -> bool:
         """Set a setting value"""
         self.data[key] = value
-        return self.save()
+        return self._save_now(fsync=True)
 
     def update(self, settings: Dict[str, Any]) -> bool:
         """Update multiple settings"""
         for key, value in settings.items():
             self.data[key] = value
-        return self.save()
+        return self._save_now(fsync=True)
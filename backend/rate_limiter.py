@@ -2,21 +2,26 @@
 # Rate limiting classes for Trade API requests
 
 import asyncio
+import re
 import time
-from typing import Optional, Dict, List
-from dataclasses import dataclass
+from collections import deque
+from typing import Any, Optional, Dict, List, Mapping, NamedTuple
 
 
-@dataclass
-class RateLimitTier:
+# One "a:b:c" triple per comma-separated tier, e.g. "5:5:10,10:10:30"
+_TIER_RE = re.compile(r"(?:^|,)\s*(\d+):(\d+):(\d+)\s*(?=,|$)")
+
+
+# NamedTuples rather than dataclasses: a dozen of these are built per API
+# response, and tuples skip the per-instance __dict__
+class RateLimitTier(NamedTuple):
     """Represents a single rate limit tier from X-Rate-Limit headers"""
     max_requests: int      # e.g., 5
     period_seconds: int    # e.g., 5
     timeout_seconds: int   # e.g., 10
 
 
-@dataclass
-class RateLimitState:
+class RateLimitState(NamedTuple):
     """Represents current state of a rate limit tier"""
     current_requests: int   # e.g., 2
     period_seconds: int     # e.g., 5
@@ -33,25 +38,65 @@ class AdaptiveRateLimiter:
     - X-Rate-Limit-Ip: 5:5:10,10:10:30,15:10:300  (requests:period:timeout)
     - X-Rate-Limit-Ip-State: 2:5:0,2:10:0,2:10:0
 
-    Thread-safe: Uses asyncio.Lock to protect concurrent access to shared state.
+    The base interval between requests is tuned AIMD-style from measured
+    latency: while the recent average response time stays under
+    latency_target it shrinks by a fixed step toward min_interval, and a slow
+    average, a 429 or a server error multiplies it toward max_interval. The
+    X-Rate-Limit state can only raise the interval above that base.
+
+    Concurrency-safe: slot reservation in wait() happens under an asyncio.Lock.
     """
 
-    def __init__(self, policy_name: str, default_interval: float = 2.5):
+    # A tier with this few requests left (or under LOW_HEADROOM_FRACTION of
+    # its limit) gets the strongest slowdown before the server has to 429
+    LOW_HEADROOM = 2
+    LOW_HEADROOM_FRACTION = 0.1
+
+    # AIMD steps: additive decrease per fast sample, multiplicative increase
+    INTERVAL_DECREASE = 0.05
+    INTERVAL_INCREASE = 2.0
+    # Responses averaged for the latency check
+    LATENCY_WINDOW = 16
+
+    def __init__(
+        self,
+        policy_name: str,
+        default_interval: float = 2.5,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        latency_target: float = 1.5
+    ):
         self.policy_name = policy_name
         self.default_interval = default_interval
+        self.min_interval = min_interval if min_interval is not None else default_interval / 2
+        self.max_interval = max_interval if max_interval is not None else default_interval * 4
+        self.latency_target = latency_target
+        # time.monotonic() clock: immune to wall-clock jumps (NTP, suspend)
         self.last_request = 0.0
+        self._next_allowed = 0.0
 
         # Parsed rate limit state
         self.rate_limits: Dict[str, List[RateLimitTier]] = {}  # rule -> tiers
         self.rate_states: Dict[str, List[RateLimitState]] = {}  # rule -> states
 
-        # Dynamic interval based on current state
+        # AIMD-tuned spacing, and recent response times feeding it
+        self.base_interval = default_interval
+        self._latencies: deque = deque(maxlen=self.LATENCY_WINDOW)
+
+        # Dynamic interval based on current state: the larger of base_interval
+        # and the floor the rate limit headers call for
         self.current_interval = default_interval
+        self._header_floor = 0.0
+        # Pause the last parsed state calls for (timeout or exhausted tier)
+        self._header_pause = 0.0
 
         # Backoff state
         self.consecutive_429s = 0
         self.backoff_until = 0.0
 
+        # Last raw value seen per header name; identical headers skip reparsing
+        self._raw_headers: Dict[str, str] = {}
+
         # Lock for thread-safe access to shared state
         self._lock: Optional[asyncio.Lock] = None
 
@@ -61,66 +106,87 @@ class AdaptiveRateLimiter:
             self._lock = asyncio.Lock()
         return self._lock
 
-    def parse_headers(self, headers: Dict[str, str]) -> None:
-        """Parse X-Rate-Limit headers from API response"""
+    def parse_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Parse X-Rate-Limit headers from API response. Only reads by key, so
+        the response's own header object (e.g. http.client.HTTPMessage) can
+        be passed as is.
+
+        Besides the interval, this pauses the limiter (see pause_remaining())
+        for a Retry-After header, a tier in timeout, or an exhausted tier.
+        """
+        now = time.monotonic()
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                self.backoff_until = max(self.backoff_until, now + float(retry_after))
+            except ValueError:
+                pass
+
         # Get rules list (e.g., "Ip,Account")
         rules_header = headers.get('X-Rate-Limit-Rules', '')
         if not rules_header:
             return
 
         rules = [r.strip() for r in rules_header.split(',') if r.strip()]
+        changed = False
 
         for rule in rules:
             # Parse limit tiers: "5:5:10,10:10:30,15:10:300"
-            limit_header = headers.get(f'X-Rate-Limit-{rule}', '')
-            state_header = headers.get(f'X-Rate-Limit-{rule}-State', '')
+            limit_key = f'X-Rate-Limit-{rule}'
+            state_key = f'{limit_key}-State'
+            limit_header = headers.get(limit_key, '')
+            state_header = headers.get(state_key, '')
 
-            if limit_header:
+            if limit_header and limit_header != self._raw_headers.get(limit_key):
+                self._raw_headers[limit_key] = limit_header
                 self.rate_limits[rule] = self._parse_limit_tiers(limit_header)
-            if state_header:
+                changed = True
+            if state_header and state_header != self._raw_headers.get(state_key):
+                self._raw_headers[state_key] = state_header
                 self.rate_states[rule] = self._parse_state_tiers(state_header)
-
-        # Update current interval based on state
-        self._update_interval()
+                changed = True
+
+        if changed:
+            # Update the header floor and pause based on state; unchanged
+            # headers keep the previous ones without the tier walk
+            self._update_interval()
+        if self._header_pause > 0:
+            # Re-armed from now on every response: a repeated timeout or
+            # exhausted state still means the window has not reset
+            self.backoff_until = max(self.backoff_until, now + self._header_pause)
+        self.current_interval = max(self.base_interval, self._header_floor)
+
+        # The next free slot was reserved with the old interval; hold it to
+        # the new one so a slowdown applies to the very next request
+        self._next_allowed = max(self._next_allowed, self.last_request + self.current_interval)
 
     def _parse_limit_tiers(self, header: str) -> List[RateLimitTier]:
         """Parse '5:5:10,10:10:30,15:10:300' into list of tiers"""
-        tiers = []
-        for tier_str in header.split(','):
-            parts = tier_str.strip().split(':')
-            if len(parts) == 3:
-                try:
-                    tiers.append(RateLimitTier(
-                        max_requests=int(parts[0]),
-                        period_seconds=int(parts[1]),
-                        timeout_seconds=int(parts[2])
-                    ))
-                except ValueError:
-                    pass
-        return tiers
+        return [
+            RateLimitTier(int(a), int(b), int(c))
+            for a, b, c in _TIER_RE.findall(header)
+        ]
 
     def _parse_state_tiers(self, header: str) -> List[RateLimitState]:
         """Parse '2:5:0,2:10:0,2:10:0' into list of states"""
-        states = []
-        for state_str in header.split(','):
-            parts = state_str.strip().split(':')
-            if len(parts) == 3:
-                try:
-                    states.append(RateLimitState(
-                        current_requests=int(parts[0]),
-                        period_seconds=int(parts[1]),
-                        timeout_remaining=int(parts[2])
-                    ))
-                except ValueError:
-                    pass
-        return states
-
-    def _update_interval(self) -> None:
-        """Calculate optimal interval based on current state"""
+        return [
+            RateLimitState(int(a), int(b), int(c))
+            for a, b, c in _TIER_RE.findall(header)
+        ]
+
+    def _update_interval(self) -> float:
+        """
+        Calculate the interval the current state calls for. Returns how long
+        to pause outright (0.0 if no tier is in timeout or exhausted); both
+        are kept in _header_floor and _header_pause.
+        """
         if not self.rate_limits or not self.rate_states:
-            return
+            self._header_pause = 0.0
+            return 0.0
 
-        min_safe_interval = self.default_interval
+        min_safe_interval = 0.0
+        pause = 0.0
 
         for rule, limits in self.rate_limits.items():
             states = self.rate_states.get(rule, [])
@@ -134,6 +200,7 @@ class AdaptiveRateLimiter:
                 # Check if we're in timeout
                 if state.timeout_remaining > 0:
                     min_safe_interval = max(min_safe_interval, float(state.timeout_remaining))
+                    pause = max(pause, float(state.timeout_remaining))
                     continue
 
                 # Calculate headroom
@@ -142,47 +209,126 @@ class AdaptiveRateLimiter:
                     usage_percent = state.current_requests / limit.max_requests
 
                     # Adaptive slowdown based on usage
-                    if usage_percent > 0.8:  # >80% used - slow down significantly
-                        if remaining_requests > 0:
-                            safe_interval = limit.period_seconds / remaining_requests
-                            min_safe_interval = max(min_safe_interval, safe_interval * 1.5)
+                    if remaining_requests <= 0:
+                        # Exhausted: the next request would be a 429, so wait
+                        # out the window
+                        min_safe_interval = max(min_safe_interval, float(limit.period_seconds))
+                        pause = max(pause, float(limit.period_seconds))
+                    elif (usage_percent > 0.8  # >80% used - slow down significantly
+                            or remaining_requests <= self.LOW_HEADROOM
+                            or remaining_requests < limit.max_requests * self.LOW_HEADROOM_FRACTION):
+                        safe_interval = limit.period_seconds / remaining_requests
+                        min_safe_interval = max(min_safe_interval, safe_interval * 1.5)
                     elif usage_percent > 0.5:  # >50% used - slight slowdown
                         if remaining_requests > 0:
                             safe_interval = limit.period_seconds / remaining_requests
                             min_safe_interval = max(min_safe_interval, safe_interval)
 
-        self.current_interval = min_safe_interval
+        self._header_floor = min_safe_interval
+        self._header_pause = pause
+        return pause
+
+    def _set_base_interval(self, interval: float) -> None:
+        self.base_interval = min(self.max_interval, max(self.min_interval, interval))
+        self.current_interval = max(self.base_interval, self._header_floor)
+
+    def _increase_interval(self) -> None:
+        """Multiplicative increase; the latency window starts over"""
+        self._latencies.clear()
+        self._set_base_interval(self.base_interval * self.INTERVAL_INCREASE)
+
+    def record_latency(self, seconds: float) -> None:
+        """Feed one response time into the AIMD controller"""
+        self._latencies.append(seconds)
+        if sum(self._latencies) / len(self._latencies) <= self.latency_target:
+            self._set_base_interval(self.base_interval - self.INTERVAL_DECREASE)
+        else:
+            self._increase_interval()
+
+    def handle_server_error(self) -> None:
+        """Back off after a 5xx: the server is struggling, not rate limiting"""
+        self._increase_interval()
+
+    def status(self) -> Dict[str, Any]:
+        """Current pacing, for display"""
+        latencies = self._latencies
+        return {
+            "interval": round(self.current_interval, 2),
+            "base_interval": round(self.base_interval, 2),
+            "avg_latency": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "paused_seconds": round(self.pause_remaining(), 1)
+        }
+
+    def pause_remaining(self) -> float:
+        """Seconds until requests may resume after a 429 or a reported pause"""
+        return max(0.0, self.backoff_until - time.monotonic())
+
+    def available_tokens(self) -> int:
+        """
+        Requests the server still allows right now: the smallest headroom
+        across all known tiers. 0 while backing off or in a timeout, 1 until
+        headers have been seen.
+        """
+        if time.monotonic() < self.backoff_until:
+            return 0
+        if not self.rate_limits or not self.rate_states:
+            return 1
+
+        tokens: Optional[int] = None
+        for rule, limits in self.rate_limits.items():
+            states = self.rate_states.get(rule, [])
+            for limit, state in zip(limits, states):
+                if state.timeout_remaining > 0:
+                    return 0
+                headroom = max(0, limit.max_requests - state.current_requests)
+                if tokens is None or headroom < tokens:
+                    tokens = headroom
+
+        return 1 if tokens is None else tokens
 
     async def wait(self) -> None:
         """
         Wait appropriate time before next request.
 
-        Thread-safe: Uses lock to serialize access, ensuring only one request
-        proceeds at a time through the rate limiting logic.
+        Each caller reserves the next free slot under the lock, then sleeps
+        outside it, so concurrent callers get distinct slots current_interval
+        apart without queueing on each other's sleeps.
         """
-        # Acquire lock to serialize requests - this ensures proper ordering
-        # and prevents race conditions when multiple coroutines call wait()
         async with self._get_lock():
-            now = time.time()
-
-            # Calculate total wait time needed
-            sleep_time = 0.0
+            now = time.monotonic()
+            # Earliest of: now, the end of the previous reservation, 429 backoff
+            slot = max(now, self._next_allowed, self.backoff_until)
+            self._next_allowed = slot + self.current_interval
+            self.last_request = slot
 
-            # Check backoff from 429
-            if now < self.backoff_until:
-                sleep_time = self.backoff_until - now
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
-            # Standard rate limiting (after backoff)
-            elapsed = (now + sleep_time) - self.last_request
-            if elapsed < self.current_interval:
-                sleep_time += self.current_interval - elapsed
-
-            # Sleep if needed (while holding lock to maintain ordering)
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
+    async def acquire_many(self, n: int) -> List[float]:
+        """
+        Reserve n consecutive slots in one go, for a burst of requests.
 
-            # Update last request time
-            self.last_request = time.time()
+        Returns the slots as time.monotonic() values, current_interval apart;
+        each request sleeps until its own slot instead of calling wait().
+        """
+        async with self._get_lock():
+            now = time.monotonic()
+            slot = max(now, self._next_allowed, self.backoff_until)
+            slots = [slot + i * self.current_interval for i in range(n)]
+            if slots:
+                self._next_allowed = slots[-1] + self.current_interval
+                self.last_request = slots[-1]
+        return slots
+
+    def release(self, unused: List[float]) -> None:
+        """
+        Hand back slots from acquire_many() that will not be used (the
+        unstarted tail of the reservation), so later requests don't queue
+        behind them. Skipped if anything was reserved after them.
+        """
+        if unused and self.last_request == unused[-1]:
+            self._next_allowed = unused[0]
+            self.last_request = unused[0] - self.current_interval
 
     def handle_429(self, retry_after: Optional[int] = None) -> float:
         """Handle 429 response with exponential backoff. Returns wait time."""
@@ -194,15 +340,19 @@ class AdaptiveRateLimiter:
             # Exponential backoff: 5, 10, 20, 40... capped at 120 seconds
             wait_time = min(5.0 * (2 ** (self.consecutive_429s - 1)), 120.0)
 
-        self.backoff_until = time.time() + wait_time
+        self.backoff_until = time.monotonic() + wait_time
         # Also increase interval for future requests
-        self.current_interval = max(self.current_interval * 1.5, 5.0)
+        self._latencies.clear()
+        self._set_base_interval(max(self.base_interval * self.INTERVAL_INCREASE, 5.0))
 
         return wait_time
 
-    def handle_success(self) -> None:
-        """Reset backoff state on successful request"""
-        if self.consecutive_429s > 0:
-            self.consecutive_429s = 0
-            # Gradually decrease interval back to default
-            self.current_interval = max(self.current_interval * 0.9, self.default_interval)
+    def handle_success(self, latency: Optional[float] = None) -> None:
+        """
+        Reset backoff state on successful request. latency (seconds until
+        the response arrived) feeds the AIMD controller; the interval then
+        comes back down additively rather than in one step.
+        """
+        self.consecutive_429s = 0
+        if latency is not None:
+            self.record_latency(latency)
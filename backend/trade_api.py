@@ -4,16 +4,252 @@
 # NOTE: This module is designed for use within Decky Loader.
 # The `decky` module must be imported inside methods, not at module level.
 
+import asyncio
 import json
+import re
+import socket
 import ssl
 import time
-import urllib.request
 import urllib.error
 import urllib.parse
-from typing import Optional, Dict, Any, List, Tuple
-
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+from .cache import ListingCache
+from .connection_pool import ConnectionPool, Response, raise_for_status
+from .persistence import StatCacheStore
 from .rate_limiter import AdaptiveRateLimiter
 
+try:
+    import orjson  # C JSON codec; parses the response bytes without a decode step
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(buf: bytes) -> Any:
+    """Parse UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+_WHITESPACE = re.compile(r'\s*')
+
+
+def _iter_result_items(buf: bytes) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level "result" array of a JSON object.
+
+    Without orjson, elements are decoded one at a time so only one item's
+    object tree is alive at once; orjson parses the whole body faster than
+    that walk could.
+    """
+    if orjson is not None:
+        yield from orjson.loads(buf).get("result") or ()
+        return
+
+    text = buf.decode("utf-8")
+    decoder = json.JSONDecoder()
+    pos = _WHITESPACE.match(text, 0).end()
+    if text[pos:pos + 1] != "{":
+        return
+    pos += 1
+    # Skip other members up to "result"
+    while True:
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] in ("}", ""):
+            return
+        key, pos = decoder.raw_decode(text, pos)
+        pos = _WHITESPACE.match(text, pos).end() + 1  # ':'
+        pos = _WHITESPACE.match(text, pos).end()
+        if key == "result":
+            break
+        _, pos = decoder.raw_decode(text, pos)
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] == ",":
+            pos += 1
+
+    if text[pos:pos + 1] != "[":
+        return
+    pos += 1
+    while True:
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] in ("]", ""):
+            return
+        item, pos = decoder.raw_decode(text, pos)
+        yield item
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] == ",":
+            pos += 1
+
+
+# Numeric values in modifier text ("+12", "-3", "1.5", "20%"), replaced by '#'
+_NUM_RE = re.compile(r'[+\-]?\d+(?:\.\d+)?%?')
+_WS_RE = re.compile(r'\s+')
+
+
+def _bucket_patterns(
+    patterns: Dict[str, int]
+) -> Tuple[Tuple[int, str, Tuple[Tuple[str, int], ...]], ...]:
+    """
+    Group patterns by their first word: (top score, word, ((pattern, score), ...)).
+    Highest score first within each group, and groups ordered by their
+    top score, so a scan can stop once nothing left can beat its best.
+    """
+    buckets: Dict[str, List[Tuple[str, int]]] = {}
+    for pattern, score in patterns.items():
+        buckets.setdefault(pattern.split(" ", 1)[0], []).append((pattern, score))
+    grouped = []
+    for word, entries in buckets.items():
+        entries.sort(key=lambda entry: -entry[1])
+        grouped.append((entries[0][1], word, tuple(entries)))
+    grouped.sort(key=lambda group: -group[0])
+    return tuple(grouped)
+
+
+# Rarities the trade API accepts in type_filters, spelled as it expects them
+_RARITY_OPTIONS = frozenset(("unique", "rare", "magic", "normal", "currency", "gem"))
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, replace numbers with '#', collapse whitespace"""
+    return _WS_RE.sub(' ', _NUM_RE.sub('#', text.lower().strip()))
+
+
+class StatIndex:
+    """
+    Partial-match index over a stat cache's keys, in cache order.
+
+    find() returns the first key that is contained in a text or contains
+    it, the same answer as testing every key in turn, without the scan.
+    """
+    __slots__ = ("keys", "_by_word", "_unindexed", "_haystack", "_offsets", "_source", "_size")
+
+    def __init__(self, cache: Dict[str, str]):
+        keys = list(cache)
+        by_word: Dict[str, List[int]] = {}
+        unindexed: List[int] = []
+        offsets = []
+        offset = 0
+        for i, key in enumerate(keys):
+            # A key inside a text has its interior words as whole words of
+            # the text (its first and last may be cut); file it under the
+            # longest one
+            interior = key.split(" ")[1:-1]
+            word = max(interior, key=len) if interior else ""
+            if word:
+                by_word.setdefault(word, []).append(i)
+            else:
+                unindexed.append(i)
+            offsets.append(offset)
+            offset += len(key) + 1
+        self.keys = keys
+        # Significant word -> indexes of keys filed under it, ascending
+        self._by_word = by_word
+        # Keys of one or two words, checked one by one
+        self._unindexed = unindexed
+        # All keys joined by NULs (stat texts have none), with each key's
+        # start offset: one str.find locates keys containing a text
+        self._haystack = "\0".join(keys)
+        self._offsets = offsets
+        self._source = cache
+        self._size = len(cache)
+
+    def is_current(self, cache: Dict[str, str]) -> bool:
+        """True if the index was built from this cache and it has not grown"""
+        return cache is self._source and len(cache) == self._size
+
+    def find(self, text: str) -> Optional[str]:
+        """First key contained in text or containing it, or None"""
+        keys = self.keys
+        if not keys:
+            return None
+        first: Optional[int] = None
+
+        # Keys containing the text: the first hit lies in the earliest one
+        if "\0" not in text:
+            pos = self._haystack.find(text)
+            if pos != -1:
+                first = bisect_right(self._offsets, pos) - 1
+
+        # Keys contained in the text, confirmed with `in`
+        by_word = self._by_word
+        for word in set(text.split(" ")):
+            for i in by_word.get(word, ()):
+                if first is not None and i >= first:
+                    break
+                if keys[i] in text:
+                    first = i
+                    break
+        for i in self._unindexed:
+            if first is not None and i >= first:
+                break
+            if keys[i] in text:
+                first = i
+                break
+
+        return None if first is None else keys[first]
+
+
+@dataclass
+class Listing:
+    """One trade listing from a /fetch response"""
+    # No per-instance __dict__; declared by hand rather than slots=True,
+    # which needs Python 3.10
+    __slots__ = ("amount", "currency", "account", "character", "online", "whisper", "indexed")
+
+    amount: Optional[float]
+    currency: Optional[str]
+    account: str
+    character: str
+    online: Optional[str]
+    whisper: str
+    indexed: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for JSON responses to the frontend"""
+        return {
+            "amount": self.amount,
+            "currency": self.currency,
+            "account": self.account,
+            "character": self.character,
+            "online": self.online,
+            "whisper": self.whisper,
+            "indexed": self.indexed,
+        }
+
+
+def _parse_listing(item: Dict[str, Any]) -> Listing:
+    """Project one /fetch result entry onto a Listing"""
+    listing = item.get("listing", {})
+    price = listing.get("price", {})
+    account_data = listing.get("account", {})
+
+    # Extract online status
+    online_data = account_data.get("online")
+    online_status = None
+    if online_data:
+        online_status = online_data.get("status") if isinstance(online_data, dict) else online_data
+
+    return Listing(
+        amount=price.get("amount"),
+        currency=price.get("currency"),
+        account=account_data.get("name", "Unknown"),
+        character=account_data.get("lastCharacterName", ""),
+        online=online_status,
+        whisper=listing.get("whisper", ""),
+        indexed=listing.get("indexed", ""),
+    )
+
 
 class TradeAPIClient:
     """
@@ -29,6 +265,11 @@ class TradeAPIClient:
     # Trade API endpoints
     BASE_URL = "https://www.pathofexile.com/api/trade2"
 
+    DEFAULT_HEADERS = {
+        "User-Agent": "PoE2-Price-Checker-Decky/1.0",
+        "Accept": "application/json"
+    }
+
     # Modifier priority tiers for search optimization
     PRIORITY_PATTERNS = {
         # Tier 1 (90-100): Most valuable mods
@@ -81,45 +322,102 @@ class TradeAPIClient:
         "stun": 32,
     }
 
+    # A pattern can only occur in the text if its first word does, so one
+    # test per word rules out the whole group behind it
+    _PRIORITY_BUCKETS = _bucket_patterns(PRIORITY_PATTERNS)
+
     def __init__(
         self,
         search_limiter: AdaptiveRateLimiter,
         fetch_limiter: AdaptiveRateLimiter,
-        ssl_context: ssl.SSLContext,
+        pool: ConnectionPool,
         league: str = "Standard",
-        poesessid: str = ""
+        poesessid: str = "",
+        stat_cache_store: Optional[StatCacheStore] = None
     ):
         self.search_limiter = search_limiter
         self.fetch_limiter = fetch_limiter
-        self.ssl_context = ssl_context
+        # Keep-alive connections, shared with the plugin's other API requests
+        self.pool = pool
         self.league = league
         self.poesessid = poesessid
+        # Keeps the normalized stat cache between runs, keyed by the ETag
+        self.stat_cache_store = stat_cache_store
 
         # Stat ID cache: normalized text -> stat ID
         self.stat_cache: Dict[str, str] = {}
+        # Partial-match index over stat_cache, rebuilt when the cache changes
+        self._stat_index: Optional[StatIndex] = None
 
         # Debug: last fetched listings
-        self.last_debug_listings: List[Dict[str, Any]] = []
+        self.last_debug_listings: List[Listing] = []
+
+        # Recently fetched listings by ID -> (Listing, icon of the item)
+        self.listing_cache = ListingCache()
+
+        base = urllib.parse.urlsplit(self.BASE_URL)
+        self._host = base.netloc
+        self._base_path = base.path
 
     def set_league(self, league: str) -> None:
         """Update the current league"""
+        if league != self.league:
+            # Cached listings came from the old league's searches
+            self.listing_cache.clear()
         self.league = league
 
     def set_poesessid(self, poesessid: str) -> None:
         """Update the POESESSID (for authenticated requests)"""
         self.poesessid = poesessid
 
+    # =========================================================================
+    # HTTP TRANSPORT
+    # =========================================================================
+
+    def warm_connections(self, count: int, timeout: float = 15) -> None:
+        """Open up to `count` connections to the Trade API ahead of a burst"""
+        self.pool.warm_connections(self._host, count, timeout)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        authenticated: bool = False,
+        timeout: float = 15
+    ) -> Response:
+        """
+        Send a request to BASE_URL + path without blocking the event loop.
+        Raises urllib.error.HTTPError for error statuses, like urlopen.
+        """
+        all_headers = dict(self.DEFAULT_HEADERS)
+        if headers:
+            all_headers.update(headers)
+        if authenticated and self.poesessid:
+            all_headers["Cookie"] = f"POESESSID={self.poesessid}"
+
+        url_path = self._base_path + path
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None, self.pool.request, method, self._host, url_path, body, all_headers, timeout
+        )
+        raise_for_status(f"https://{self._host}{url_path}", response)
+        return response
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        self.pool.close()
+
     # =========================================================================
     # STAT ID MANAGEMENT
     # =========================================================================
 
-    def normalize_modifier_text(self, text: str) -> str:
-        """Normalize modifier text for matching"""
-        import re
-        normalized = text.lower().strip()
-        normalized = re.sub(r'[+\-]?\d+(?:\.\d+)?%?', '#', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized)
-        return normalized
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def normalize_modifier_text(text: str) -> str:
+        """Normalize modifier text for matching (cached, items repeat the same mods)"""
+        return _normalize(text)
 
     def find_stat_id(self, modifier_text: str) -> Optional[str]:
         """Find stat ID for a modifier text"""
@@ -132,56 +430,90 @@ class TradeAPIClient:
         if normalized in self.stat_cache:
             return self.stat_cache[normalized]
 
-        # Try partial match
-        for pattern, stat_id in self.stat_cache.items():
-            if pattern in normalized or normalized in pattern:
-                return stat_id
+        # Try partial match: the first pattern in cache order that is
+        # contained in the text or contains it
+        pattern = self._get_stat_index().find(normalized)
+        return None if pattern is None else self.stat_cache[pattern]
+
+    def _get_stat_index(self) -> StatIndex:
+        """Partial-match index for the current stat_cache"""
+        index = self._stat_index
+        if index is None or not index.is_current(self.stat_cache):
+            index = self._stat_index = StatIndex(self.stat_cache)
+        return index
 
-        return None
+    async def _build_stat_index(self) -> None:
+        """Rebuild the partial-match index in a worker thread"""
+        loop = asyncio.get_running_loop()
+        self._stat_index = await loop.run_in_executor(None, StatIndex, self.stat_cache)
 
     def score_modifier_priority(self, modifier_text: str) -> int:
         """
-        Score a modifier's priority for tiered searches.
-        Higher score = higher priority = searched first.
+        Score a modifier's priority for tiered searches: the highest score
+        among matching patterns. Higher score = higher priority = searched first.
         """
         text_lower = modifier_text.lower()
 
-        for pattern, score in self.PRIORITY_PATTERNS.items():
-            if pattern in text_lower:
-                return score
-
         # Default score for unknown mods
-        return 25
+        best = 25
+
+        for top_score, word, patterns in self._PRIORITY_BUCKETS:
+            if top_score <= best:
+                break
+            if word in text_lower:
+                for pattern, score in patterns:
+                    if score <= best:
+                        break
+                    if pattern in text_lower:
+                        best = score
+
+        return best
 
     async def load_stat_ids_from_api(self) -> bool:
-        """Load stat IDs from Trade API"""
+        """
+        Load stat IDs from Trade API.
+
+        With a stat_cache_store, the request is conditional on the stored
+        ETag and a 304 reuses the normalized cache from disk.
+        """
         import decky
 
-        url = f"{self.BASE_URL}/data/stats"
+        store = self.stat_cache_store
+        headers: Dict[str, str] = {}
+        if store is not None:
+            store.load()
+            etag = store.get_etag()
+            if etag and store.get_cache():
+                headers["If-None-Match"] = etag
 
         try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                    "Accept": "application/json"
-                }
-            )
+            response = await self._request("GET", "/data/stats", headers=headers)
 
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                data = json.loads(response.read().decode())
+            if response.status == 304 and store is not None:
+                self.stat_cache.update(store.get_cache())
+                await self._build_stat_index()
+                decky.logger.info(f"Loaded {len(self.stat_cache)} stat IDs from disk (unchanged)")
+                return True
 
-                for group in data.get("result", []):
-                    for entry in group.get("entries", []):
-                        stat_id = entry.get("id")
-                        stat_text = entry.get("text", "")
+            data = _json_loads(response.body)
 
-                        if stat_id and stat_text:
-                            normalized = self.normalize_modifier_text(stat_text)
-                            self.stat_cache[normalized] = stat_id
+            for group in data.get("result", []):
+                for entry in group.get("entries", []):
+                    stat_id = entry.get("id")
+                    stat_text = entry.get("text", "")
 
-                decky.logger.info(f"Loaded {len(self.stat_cache)} stat IDs from API")
-                return True
+                    if stat_id and stat_text:
+                        # Uncached: thousands of one-off texts would flush the cache
+                        normalized = _normalize(stat_text)
+                        self.stat_cache[normalized] = stat_id
+
+            # Build the partial-match index now rather than on the first lookup
+            await self._build_stat_index()
+            decky.logger.info(f"Loaded {len(self.stat_cache)} stat IDs from API")
+
+            if store is not None:
+                store.set_cache(dict(self.stat_cache), etag=response.headers.get("ETag"))
+            return True
 
         except Exception as e:
             decky.logger.error(f"Failed to load stat IDs: {e}")
@@ -203,44 +535,45 @@ class TradeAPIClient:
         Execute a search query against the Trade API.
 
         Returns:
-            {success: bool, id?: str, total?: int, result?: List[str], error?: str}
+            {success: bool, id?: str, total?: int, result?: List[str], error?: str,
+             retry_after?: float, rate_limited?: bool}
         """
         import decky
 
-        url = f"{self.BASE_URL}/search/poe2/{urllib.parse.quote(self.league)}"
+        path = f"/search/poe2/{urllib.parse.quote(self.league, safe='')}"
 
         try:
             await self.search_limiter.wait()
 
-            req_data = json.dumps(query).encode("utf-8")
-            req = urllib.request.Request(
-                url,
-                data=req_data,
-                headers={
-                    "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                },
-                method="POST"
+            response = await self._request(
+                "POST",
+                path,
+                body=_json_dumps(query),
+                headers={"Content-Type": "application/json"},
+                authenticated=True
             )
 
-            if self.poesessid:
-                req.add_header("Cookie", f"POESESSID={self.poesessid}")
-
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                headers = {k: v for k, v in response.headers.items()}
-                self.search_limiter.parse_headers(headers)
-                self.search_limiter.handle_success()
+            self.search_limiter.parse_headers(response.headers)
+            self.search_limiter.handle_success(response.elapsed)
 
-                result = json.loads(response.read().decode())
-                return {
-                    "success": True,
-                    "id": result.get("id"),
-                    "total": result.get("total", 0),
-                    "result": result.get("result", [])
-                }
+            result = _json_loads(response.body)
+            return {
+                "success": True,
+                "id": result.get("id"),
+                "total": result.get("total", 0),
+                "result": result.get("result", []),  # All result IDs (API returns max ~100)
+                "error": None
+            }
 
         except urllib.error.HTTPError as e:
+            error_body = ""
+            try:
+                error_body = e.read().decode()
+            except Exception:
+                pass
+
+            decky.logger.error(f"Trade API HTTP error: {e.code} - {error_body}")
+
             if e.code == 429:
                 retry_after = None
                 try:
@@ -248,11 +581,50 @@ class TradeAPIClient:
                 except (ValueError, TypeError):
                     pass
                 wait_time = self.search_limiter.handle_429(retry_after)
-                decky.logger.warning(f"Rate limited, waiting {wait_time:.1f}s")
-                return {"success": False, "error": f"Rate limited ({wait_time:.0f}s)", "rate_limited": True}
-            else:
-                decky.logger.error(f"Trade API search error: {e.code}")
-                return {"success": False, "error": f"HTTP {e.code}"}
+                until = time.localtime(time.time() + wait_time)
+                decky.logger.warning(f"Rate limited (429). Backing off for {wait_time:.1f}s until {time.strftime('%H:%M:%S', until)}")
+                return {
+                    "success": False,
+                    "error": f"Rate limited. Try again at {time.strftime('%H:%M', until)}",
+                    "retry_after": wait_time,
+                    "rate_limited": True
+                }
+
+            if e.code >= 500:
+                self.search_limiter.handle_server_error()
+
+            if e.code == 400:
+                # Parse error message from response
+                try:
+                    error_msg = _json_loads(error_body).get("error", {}).get("message", "Bad request")
+                    if "Unknown item base type" in error_msg:
+                        return {
+                            "success": False,
+                            "error": "Unknown item type. This item may be currency, a quest item, or not tradeable."
+                        }
+                    return {"success": False, "error": f"Trade API: {error_msg}"}
+                except (ValueError, KeyError, AttributeError):
+                    pass  # Error response format not parseable
+
+            return {
+                "success": False,
+                "error": f"Trade API Error {e.code}: {error_body[:100] if error_body else 'Unknown error'}"
+            }
+
+        except (TimeoutError, socket.timeout) as e:  # distinct classes before Python 3.10
+            decky.logger.error(f"Trade API search timed out: {e}")
+            return {"success": False, "error": "Request timed out. Trade API may be slow - try again."}
+
+        except ssl.SSLError as e:
+            decky.logger.error(f"Trade API SSL error: {e}")
+            return {"success": False, "error": "SSL/Connection error. Try again in a moment."}
+
+        except (urllib.error.URLError, OSError) as e:
+            decky.logger.error(f"Trade API connection error: {e}")
+            return {
+                "success": False,
+                "error": "Connection failed. Check your internet connection or try again later."
+            }
 
         except Exception as e:
             decky.logger.error(f"Trade API search exception: {e}")
@@ -268,7 +640,9 @@ class TradeAPIClient:
         Fetch detailed listings from Trade API in batches.
 
         Returns:
-            {success: bool, listings: List[Dict], icon?: str, error?: str}
+            {success: bool, listings: List[Listing], icon?: str, error?: str,
+             retry_after?: float, rate_limited?: bool}
+            (Listing.to_dict() where a JSON-ready dict is needed)
         """
         import decky
 
@@ -276,97 +650,157 @@ class TradeAPIClient:
             return {"success": False, "error": "No results to fetch", "listings": []}
 
         ids_to_fetch = result_ids[:limit] if limit else result_ids
-        total_to_fetch = len(ids_to_fetch)
 
-        all_listings = []
-        first_item_icon = None
-        batch_size = 10
-
-        for batch_start in range(0, total_to_fetch, batch_size):
-            batch_ids = ids_to_fetch[batch_start:batch_start + batch_size]
-            if not batch_ids:
-                break
-
-            await self.fetch_limiter.wait()
-
-            ids_param = ",".join(batch_ids)
-            url = f"{self.BASE_URL}/fetch/{ids_param}?query={query_id}"
+        # Listings fetched within the cache TTL are reused; only the rest go
+        # out, still in batches of 10 (the API maximum per URL)
+        cached: Dict[str, Tuple[Listing, Optional[str]]] = {}
+        missing: List[str] = []
+        for listing_id in ids_to_fetch:
+            entry = self.listing_cache.get(listing_id)
+            if entry is not None:
+                cached[listing_id] = entry
+            else:
+                missing.append(listing_id)
+        if cached:
+            decky.logger.info(f"{len(cached)}/{len(ids_to_fetch)} listings from cache")
 
-            try:
-                req = urllib.request.Request(
-                    url,
-                    headers={
-                        "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                        "Accept": "application/json"
-                    }
+        batch_size = 10
+        batches = [
+            missing[i:i + batch_size]
+            for i in range(0, len(missing), batch_size)
+        ]
+
+        # Overlap batches up to the burst the server currently allows; wait()
+        # still hands each one its own slot
+        parallelism = max(1, min(len(batches), self.fetch_limiter.available_tokens()))
+        sem = asyncio.Semaphore(parallelism)
+        if parallelism > 1:
+            self.warm_connections(parallelism)
+        # Set on the first failure: batches not yet started are dropped
+        stopped = asyncio.Event()
+        # Backoff from a 429, if a batch hit one
+        retry_wait: List[float] = []
+
+        # Every batch's slot is reserved up front in one limiter call
+        slots = await self.fetch_limiter.acquire_many(len(batches))
+        started = [False] * len(batches)
+
+        def stop() -> None:
+            if not stopped.is_set():
+                stopped.set()
+                # Give the unstarted batches' slots back to the limiter
+                self.fetch_limiter.release(
+                    [slot for slot, began in zip(slots, started) if not began]
                 )
 
-                if self.poesessid:
-                    req.add_header("Cookie", f"POESESSID={self.poesessid}")
-
-                with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                    headers = {k: v for k, v in response.headers.items()}
-                    self.fetch_limiter.parse_headers(headers)
-                    self.fetch_limiter.handle_success()
-
-                    result = json.loads(response.read().decode())
-
-                    for item in result.get("result", []):
-                        if not item:
-                            continue
-
-                        # Extract icon from first item
-                        if first_item_icon is None:
-                            item_data = item.get("item", {})
-                            first_item_icon = item_data.get("icon")
-
-                        listing = item.get("listing", {})
-                        price = listing.get("price", {})
-                        account_data = listing.get("account", {})
-
-                        # Extract online status
-                        online_data = account_data.get("online")
-                        online_status = None
-                        if online_data:
-                            online_status = online_data.get("status") if isinstance(online_data, dict) else online_data
-
-                        all_listings.append({
-                            "amount": price.get("amount"),
-                            "currency": price.get("currency"),
-                            "account": account_data.get("name", "Unknown"),
-                            "character": account_data.get("lastCharacterName", ""),
-                            "online": online_status,
-                            "whisper": listing.get("whisper", ""),
-                            "indexed": listing.get("indexed", ""),
-                        })
-
-            except urllib.error.HTTPError as e:
-                if e.code == 429:
-                    retry_after = None
+        async def run_batch(
+            index: int,
+            batch_ids: List[str]
+        ) -> Optional[Tuple[List[Tuple[str, Listing]], Optional[str]]]:
+            async with sem:
+                if stopped.is_set():
+                    return None
+                delay = slots[index] - time.monotonic()
+                if delay > 0:
+                    # Sleep until the slot, waking early if a batch fails
                     try:
-                        retry_after = int(e.headers.get('Retry-After', 0))
-                    except (ValueError, TypeError):
+                        await asyncio.wait_for(stopped.wait(), delay)
+                    except asyncio.TimeoutError:
                         pass
-                    self.fetch_limiter.handle_429(retry_after)
-                    decky.logger.warning(f"Rate limited during fetch")
-                    break
-                else:
-                    decky.logger.error(f"Trade API fetch error: {e.code}")
-                    break
+                if stopped.is_set():
+                    return None
+                started[index] = True
 
-            except Exception as e:
-                decky.logger.error(f"Trade API fetch exception: {e}")
-                break
+                try:
+                    return await self._fetch_batch(batch_ids, query_id)
+
+                except urllib.error.HTTPError as e:
+                    stop()
+                    if e.code == 429:
+                        retry_after = None
+                        try:
+                            retry_after = int(e.headers.get('Retry-After', 0))
+                        except (ValueError, TypeError):
+                            pass
+                        retry_wait.append(self.fetch_limiter.handle_429(retry_after))
+                        decky.logger.warning(f"Rate limited during fetch, backing off {retry_wait[-1]:.1f}s")
+                    else:
+                        if e.code >= 500:
+                            self.fetch_limiter.handle_server_error()
+                        decky.logger.error(f"Trade API fetch error: {e.code}")
+
+                except Exception as e:
+                    stop()
+                    decky.logger.error(f"Trade API fetch exception: {e}")
+
+                return None
+
+        results = await asyncio.gather(*(run_batch(i, b) for i, b in enumerate(batches)))
+
+        for result in results:
+            if result is not None:
+                pairs, icon = result
+                for listing_id, listing in pairs:
+                    entry = (listing, icon)
+                    cached[listing_id] = entry
+                    self.listing_cache.put(listing_id, entry)
+
+        # Reassemble in the order the search returned the IDs
+        all_listings: List[Listing] = []
+        first_item_icon = None
+        for listing_id in ids_to_fetch:
+            entry = cached.get(listing_id)
+            if entry is not None:
+                all_listings.append(entry[0])
+                if first_item_icon is None:
+                    first_item_icon = entry[1]
 
         # Store for debugging
         self.last_debug_listings = all_listings[:5]
 
-        return {
+        result = {
             "success": len(all_listings) > 0,
             "listings": all_listings,
             "icon": first_item_icon,
             "error": None if all_listings else "No listings fetched"
         }
+        if retry_wait:
+            result["retry_after"] = max(retry_wait)
+            result["rate_limited"] = True
+        return result
+
+    async def _fetch_batch(
+        self,
+        batch_ids: List[str],
+        query_id: str
+    ) -> Tuple[List[Tuple[str, Listing]], Optional[str]]:
+        """Fetch one batch of listings. Returns ([(listing ID, listing)], first item icon)."""
+        ids_param = ",".join(batch_ids)
+        path = f"/fetch/{ids_param}?query={query_id}"
+
+        response = await self._request("GET", path, authenticated=True)
+
+        self.fetch_limiter.parse_headers(response.headers)
+        self.fetch_limiter.handle_success(response.elapsed)
+
+        listings = []
+        first_item_icon = None
+
+        # Results come back in request order, with null for gone listings
+        items = zip(batch_ids, _iter_result_items(response.body))
+
+        # Extract icon from first item, so the main loop needs no icon check
+        for listing_id, item in items:
+            if item:
+                first_item_icon = item.get("item", {}).get("icon")
+                listings.append((item.get("id") or listing_id, _parse_listing(item)))
+                break
+
+        for listing_id, item in items:
+            if item:
+                listings.append((item.get("id") or listing_id, _parse_listing(item)))
+
+        return listings, first_item_icon
 
     # =========================================================================
     # QUERY BUILDING
@@ -396,95 +830,62 @@ class TradeAPIClient:
     ) -> Dict[str, Any]:
         """Build a Trade API query from parameters"""
 
-        query: Dict[str, Any] = {
-            "query": {
-                "status": {"option": "online"},
-                "stats": [{"type": "and", "filters": []}]
-            },
-            "sort": {"price": "asc"}
-        }
-
-        # Item name (for uniques)
-        if item_name:
-            query["query"]["name"] = item_name
-
-        # Base type
-        if base_type:
-            query["query"]["type"] = base_type
-
-        # Rarity filter
-        if rarity and rarity.lower() != "any":
-            rarity_map = {
-                "unique": "unique",
-                "rare": "rare",
-                "magic": "magic",
-                "normal": "normal",
-                "currency": "currency",
-                "gem": "gem"
-            }
-            if rarity.lower() in rarity_map:
-                query["query"]["filters"] = query["query"].get("filters", {})
-                query["query"]["filters"]["type_filters"] = {
-                    "filters": {"rarity": {"option": rarity_map[rarity.lower()]}}
-                }
-
-        # Initialize filters
-        filters = query["query"].get("filters", {})
+        # Each filter group is filled as a flat dict and only wrapped and
+        # attached below if it ended up non-empty
 
-        # Type filters (ilvl, quality)
-        type_filters = filters.get("type_filters", {"filters": {}})
+        # Type filters (rarity, ilvl, quality)
+        type_filters: Dict[str, Any] = {}
+        if rarity:
+            rarity_option = rarity.lower()
+            if rarity_option in _RARITY_OPTIONS:
+                type_filters["rarity"] = {"option": rarity_option}
         if item_level and item_level > 1:
-            type_filters["filters"]["ilvl"] = {"min": item_level - 10}
+            type_filters["ilvl"] = {"min": item_level - 10}
         if quality and quality > 0:
-            type_filters["filters"]["quality"] = {"min": max(0, quality - 5)}
-        if type_filters["filters"]:
-            filters["type_filters"] = type_filters
+            type_filters["quality"] = {"min": max(0, quality - 5)}
 
         # Equipment filters (defense, weapon stats)
-        equip_filters: Dict[str, Any] = {"filters": {}}
-
+        equip_filters: Dict[str, Any] = {}
         if armour and armour > 50:
-            equip_filters["filters"]["ar"] = {"min": int(armour * 0.7)}
+            equip_filters["ar"] = {"min": int(armour * 0.7)}
         if evasion and evasion > 50:
-            equip_filters["filters"]["ev"] = {"min": int(evasion * 0.7)}
+            equip_filters["ev"] = {"min": int(evasion * 0.7)}
         if energy_shield and energy_shield > 30:
-            equip_filters["filters"]["es"] = {"min": int(energy_shield * 0.7)}
+            equip_filters["es"] = {"min": int(energy_shield * 0.7)}
         if block and block > 10:
-            equip_filters["filters"]["block"] = {"min": int(block * 0.7)}
+            equip_filters["block"] = {"min": int(block * 0.7)}
         if spirit and spirit > 10:
-            equip_filters["filters"]["spirit"] = {"min": int(spirit * 0.7)}
+            equip_filters["spirit"] = {"min": int(spirit * 0.7)}
         if pdps and pdps > 0:
-            equip_filters["filters"]["pdps"] = {"min": int(pdps * 0.7)}
+            equip_filters["pdps"] = {"min": int(pdps * 0.7)}
         if edps and edps > 0:
-            equip_filters["filters"]["edps"] = {"min": int(edps * 0.7)}
+            equip_filters["edps"] = {"min": int(edps * 0.7)}
         if attack_speed and attack_speed > 1.0:
-            equip_filters["filters"]["aps"] = {"min": round(attack_speed * 0.9, 2)}
+            equip_filters["aps"] = {"min": round(attack_speed * 0.9, 2)}
         if crit_chance and crit_chance > 5:
-            equip_filters["filters"]["crit"] = {"min": round(crit_chance * 0.8, 1)}
+            equip_filters["crit"] = {"min": round(crit_chance * 0.8, 1)}
         if socket_count and socket_count >= 2:
-            equip_filters["filters"]["rune_sockets"] = {"min": socket_count - 1}
-
-        if equip_filters["filters"]:
-            filters["equipment_filters"] = equip_filters
+            equip_filters["rune_sockets"] = {"min": socket_count - 1}
 
         # Misc filters (gem level, corrupted)
-        misc_filters: Dict[str, Any] = {"filters": {}}
+        misc_filters: Dict[str, Any] = {}
         if gem_level and gem_level > 1:
-            misc_filters["filters"]["gem_level"] = {"min": gem_level}
+            misc_filters["gem_level"] = {"min": gem_level}
         if corrupted is not None:
-            misc_filters["filters"]["corrupted"] = {"option": corrupted}
-
-        if misc_filters["filters"]:
-            filters["misc_filters"] = misc_filters
-
-        # Trade filters
+            misc_filters["corrupted"] = {"option": corrupted}
+
+        filters: Dict[str, Any] = {}
+        if type_filters:
+            filters["type_filters"] = {"filters": type_filters}
+        if equip_filters:
+            filters["equipment_filters"] = {"filters": equip_filters}
+        if misc_filters:
+            filters["misc_filters"] = {"filters": misc_filters}
         filters["trade_filters"] = {"filters": {"sale_type": {"option": "priced"}}}
 
-        query["query"]["filters"] = filters
-
         # Stat filters (modifiers)
+        stat_filters: List[Dict[str, Any]] = []
         if modifiers:
-            stat_filters = []
             for mod in modifiers:
                 if not mod.get("enabled", True):
                     continue
@@ -499,35 +900,37 @@ class TradeAPIClient:
                         stat_filter["value"] = {"min": mod["min"]}
                     stat_filters.append(stat_filter)
 
-            if stat_filters:
-                query["query"]["stats"][0]["filters"] = stat_filters
+        query_body: Dict[str, Any] = {
+            "status": {"option": "online"},
+            "stats": [{"type": "and", "filters": stat_filters}]
+        }
+
+        # Item name (for uniques)
+        if item_name:
+            query_body["name"] = item_name
+
+        # Base type
+        if base_type:
+            query_body["type"] = base_type
+
+        query_body["filters"] = filters
 
-        return query
+        return {"query": query_body, "sort": {"price": "asc"}}
 
     async def get_available_leagues(self) -> Dict[str, Any]:
         """Fetch available leagues from the Trade API"""
         import decky
 
-        url = f"{self.BASE_URL}/data/leagues"
-
         try:
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                    "Accept": "application/json"
-                }
-            )
-
-            with urllib.request.urlopen(req, timeout=10, context=self.ssl_context) as response:
-                data = json.loads(response.read().decode())
-                leagues = []
-                for league in data.get("result", []):
-                    leagues.append({
-                        "id": league.get("id", ""),
-                        "text": league.get("text", league.get("id", ""))
-                    })
-                return {"success": True, "leagues": leagues}
+            response = await self._request("GET", "/data/leagues", timeout=10)
+            data = _json_loads(response.body)
+            leagues = []
+            for league in data.get("result", []):
+                leagues.append({
+                    "id": league.get("id", ""),
+                    "text": league.get("text", league.get("id", ""))
+                })
+            return {"success": True, "leagues": leagues}
 
         except Exception as e:
             decky.logger.error(f"Failed to fetch leagues: {e}")
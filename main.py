@@ -4,14 +4,22 @@
 import asyncio
 import json
 import os
+import re
 import sys
+import tempfile
 import time
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 import urllib.request
 import urllib.error
 import urllib.parse
 import ssl
 
+try:
+    import orjson  # C JSON codec; parses the response bytes without a decode step
+except ImportError:  # optional; fall back to stdlib json
+    orjson = None
+
 # Add plugin directory to path for backend module imports
 # This is needed because Decky sandboxes the plugin
 _plugin_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +29,7 @@ if _plugin_dir not in sys.path:
 # Import from backend modules (these can be at module level since they don't use decky)
 from backend import (
     AdaptiveRateLimiter,
+    ConnectionPool,
     SearchResultCache,
     ClipboardManager,
     PriceAnalytics,
@@ -29,9 +38,173 @@ from backend import (
     PriceHistoryStore,
     StatCacheStore,
     SettingsStore,
+    StatIndex,
+    TradeAPIClient,
 )
 
 
+# Numbers in stat texts, replaced by '#' when normalizing
+_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _normalize_stat_text(text: str) -> str:
+    """Normalize stat / modifier text for stat_cache lookups"""
+    return _NUM_RE.sub('#', text).replace('+', '').strip().lower()
+
+
+# Modifier priority rules, first match wins: (term groups, score). A rule
+# matches when every group has at least one of its terms in the text.
+_MOD_PRIORITY_RULES: Tuple[Tuple[Tuple[Tuple[str, ...], ...], int], ...] = (
+    # Tier 1: Most valuable mods (90-100)
+    ((("all elemental resist", "all resistance"),), 100),
+    ((("maximum life",), ("%",)), 95),
+    ((("movement speed",),), 90),
+    # Tier 2: Very valuable (80-89)
+    ((("critical",), ("multiplier",)), 85),
+    ((("level",), ("skill",)), 82),
+    ((("maximum life",),), 80),
+    # Tier 3: Good mods (65-79)
+    ((("fire resist", "cold resist", "lightning resist", "chaos resist"),), 75),
+    ((("attack speed",),), 70),
+    ((("cast speed",),), 70),
+    ((("critical",), ("chance",)), 68),
+    # Tier 4: Decent mods (50-64)
+    ((("physical damage",),), 62),
+    ((("strength", "dexterity", "intelligence"),), 55),
+    ((("mana",),), 52),
+    # Tier 5: Lower priority (30-49)
+    ((("armour", "evasion", "energy shield"),), 45),
+    ((("accuracy",),), 40),
+)
+_MOD_PRIORITY_DEFAULT = 30
+
+_MOD_PRIORITY_TABLE = tuple(
+    (tuple(frozenset(group) for group in groups), score)
+    for groups, score in _MOD_PRIORITY_RULES
+)
+_MOD_TERMS = sorted(
+    {term for groups, _ in _MOD_PRIORITY_RULES for group in groups for term in group},
+    key=len, reverse=True
+)
+# One scan finds every rule term: the lookahead matches at each position, so
+# overlapping terms are all reported. Only the longest term starting at a
+# position is captured, so a match also implies the terms that prefix it.
+_MOD_TERM_RE = re.compile("(?=(" + "|".join(re.escape(term) for term in _MOD_TERMS) + "))")
+_MOD_TERM_PREFIXES = {
+    term: frozenset(other for other in _MOD_TERMS if term.startswith(other))
+    for term in _MOD_TERMS
+}
+
+
+def _parse_json(body: bytes) -> Any:
+    """Parse a JSON response body"""
+    # Both parsers take bytes, so no decoded copy of the body is made
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _get_json_blocking(url: str, headers: Dict[str, str], timeout: float, pool: ConnectionPool) -> Any:
+    """GET url over a pooled keep-alive connection and parse the JSON body (blocking)"""
+    return _parse_json(pool.get(url, headers, timeout).body)
+
+
+def _get_json_if_changed_blocking(
+    url: str,
+    headers: Dict[str, str],
+    timeout: float,
+    pool: ConnectionPool,
+    etag: Optional[str]
+) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Conditional GET (blocking): with an etag, sends If-None-Match. Returns
+    (parsed body, response ETag), or (None, etag) if the server answered
+    304 Not Modified.
+    """
+    if etag:
+        headers = dict(headers, **{"If-None-Match": etag})
+    response = pool.get(url, headers, timeout)
+    if response.status == 304:
+        return None, etag
+    return _parse_json(response.body), response.headers.get("ETag")
+
+
+async def _get_json(url: str, headers: Dict[str, str], timeout: float, pool: ConnectionPool) -> Any:
+    """GET url and parse the JSON body in a worker thread, so the event loop keeps running"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _get_json_blocking, url, headers, timeout, pool)
+
+
+async def _get_json_if_changed(
+    url: str,
+    headers: Dict[str, str],
+    timeout: float,
+    pool: ConnectionPool,
+    etag: Optional[str]
+) -> Tuple[Optional[Any], Optional[str]]:
+    """_get_json_if_changed_blocking in a worker thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, _get_json_if_changed_blocking, url, headers, timeout, pool, etag
+    )
+
+
+async def _build_stat_index(cache: Dict[str, str]) -> StatIndex:
+    """Build the partial-match index for a stat cache in a worker thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, StatIndex, cache)
+
+
+def _read_json_file(path: str) -> Any:
+    """Read and parse a JSON file (blocking)"""
+    with open(path, "rb") as f:
+        buf = f.read()
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+def _write_json_file(path: str, obj: Any) -> None:
+    """
+    Write obj as indented JSON (blocking). Goes through a temp file in the
+    same directory and os.replace, so a crash mid-write keeps the old file.
+    """
+    if orjson is not None:
+        buf = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        buf = json.dumps(obj, indent=2).encode("utf-8")
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        mode="wb", dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False
+    ) as tmp:
+        try:
+            tmp.write(buf)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+async def _aread_json(path: str) -> Any:
+    """Read a JSON file in a worker thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _read_json_file, path)
+
+
+async def _awrite_json(path: str, obj: Any) -> None:
+    """Atomically write a JSON file in a worker thread"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_json_file, path, obj)
+
+
 # Keep simple RateLimiter for backward compatibility
 class RateLimiter:
     """Simple rate limiter for API requests (legacy)"""
@@ -64,13 +237,16 @@ class Plugin:
     search_cache: SearchResultCache = None  # type: ignore
 
     ssl_context = None
+    connection_pool: ConnectionPool = None  # type: ignore  # keep-alive connections for API requests
+    trade_client: TradeAPIClient = None  # type: ignore  # official Trade API search/fetch
     stat_cache: Dict[str, str] = None  # type: ignore  # text pattern -> stat ID
+    stat_index: Optional[StatIndex] = None  # partial-match index over stat_cache
     currency_rates: Dict[str, float] = None  # type: ignore  # currency -> chaos value
     price_history: Dict[str, List[Dict[str, Any]]] = None  # type: ignore  # item_key -> [price records]
     scan_history: List[Dict[str, Any]] = None  # type: ignore  # List of scan records
     MAX_SCAN_HISTORY = 50  # Keep last 50 scanned items
     ICON_CACHE_DIR = "icon_cache"  # Subdirectory for cached icons
-    STAT_CACHE_FILE = "stat_cache.json"  # Cached stat IDs from Trade API
+    STAT_CACHE_FILE = "stat_cache.pickle"  # Cached stat IDs from Trade API
 
     # Price learning data - collected from exact matches to improve estimates
     # Structure: {item_class: [{quality_score, mods, price, currency, timestamp}]}
@@ -154,6 +330,12 @@ class Plugin:
         Plugin.ssl_context = ssl.create_default_context()
         Plugin.ssl_context.check_hostname = False
         Plugin.ssl_context.verify_mode = ssl.CERT_NONE
+        Plugin.connection_pool = ConnectionPool(Plugin.ssl_context)
+        Plugin.trade_client = TradeAPIClient(
+            Plugin.search_limiter,
+            Plugin.fetch_limiter,
+            Plugin.connection_pool
+        )
 
         # Initialize new backend modules
         def _decky_logger(msg: str) -> None:
@@ -163,8 +345,16 @@ class Plugin:
 
         Plugin.clipboard_manager = ClipboardManager(logger=_decky_logger)
         Plugin.price_analytics = PriceAnalytics(logger=_decky_logger)
-        Plugin.price_learning_store = PriceLearningStore(settings_dir, logger=_decky_logger)
-        Plugin.scan_history_store = ScanHistoryStore(settings_dir, logger=_decky_logger)
+        Plugin.price_learning_store = PriceLearningStore(
+            settings_dir,
+            logger=_decky_logger,
+            max_records_per_class=Plugin.MAX_LEARNING_RECORDS_PER_CLASS
+        )
+        Plugin.scan_history_store = ScanHistoryStore(
+            settings_dir,
+            logger=_decky_logger,
+            max_records=Plugin.MAX_SCAN_HISTORY
+        )
         Plugin.price_history_store = PriceHistoryStore(settings_dir, logger=_decky_logger)
         Plugin.stat_cache_store = StatCacheStore(settings_dir, logger=_decky_logger)
 
@@ -215,9 +405,8 @@ class Plugin:
         try:
             settings_path = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "settings.json")
             if os.path.exists(settings_path):
-                with open(settings_path, "r") as f:
-                    loaded = json.load(f)
-                    self.settings.update(loaded)
+                loaded = await _aread_json(settings_path)
+                self.settings.update(loaded)
                 decky.logger.info("Settings loaded successfully")
         except Exception as e:
             decky.logger.error(f"Failed to load settings: {e}")
@@ -228,6 +417,17 @@ class Plugin:
         """Plugin cleanup on disable"""
         import decky
         decky.logger.info("PoE2 Price Checker unloading...")
+        # Write out any debounced store saves and close open log handles
+        for store in (
+            Plugin.price_learning_store,
+            Plugin.scan_history_store,
+            Plugin.price_history_store,
+            Plugin.stat_cache_store,
+        ):
+            if store is not None:
+                store.close()
+        if Plugin.trade_client is not None:
+            await Plugin.trade_client.close()
         # Save settings inline
         try:
             if Plugin.settings is None:
@@ -235,15 +435,13 @@ class Plugin:
                 return
 
             settings_path = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "settings.json")
-            os.makedirs(os.path.dirname(settings_path), exist_ok=True)
 
             # SECURITY: Exclude empty poesessid from saved file
             settings_to_save = dict(self.settings)
             if not settings_to_save.get("poesessid"):
                 settings_to_save.pop("poesessid", None)
 
-            with open(settings_path, "w") as f:
-                json.dump(settings_to_save, f, indent=2)
+            await _awrite_json(settings_path, settings_to_save)
             decky.logger.info("Settings saved successfully")
         except Exception as e:
             decky.logger.error(f"Failed to save settings: {e}")
@@ -300,57 +498,77 @@ class Plugin:
         import decky
         Plugin.stat_cache_store.load()
         Plugin.stat_cache = Plugin.stat_cache_store.get_cache()
+        # Index right away (off the loop), so partial matches work while the
+        # API request is still in flight
+        Plugin.stat_index = await _build_stat_index(Plugin.stat_cache) if Plugin.stat_cache else None
         count = len(Plugin.stat_cache)
         decky.logger.info(f"Loaded {count} stat IDs from disk cache")
         return count > 0
 
-    async def save_stat_cache_to_disk(self) -> bool:
-        """Save stat cache to store. Returns True if saved successfully."""
+    async def save_stat_cache_to_disk(self, etag: Optional[str] = None) -> bool:
+        """
+        Save stat cache to store, with the ETag of the /data/stats response
+        it came from. Returns True if saved successfully.
+        """
         import decky
-        success = Plugin.stat_cache_store.set_cache(Plugin.stat_cache)
+        success = Plugin.stat_cache_store.set_cache(Plugin.stat_cache, etag=etag)
         decky.logger.info(f"Saved {len(Plugin.stat_cache)} stat IDs to disk cache")
         return success
 
     async def load_stat_ids_from_api(self) -> bool:
-        """Load stat IDs from Trade API. Returns True if loaded successfully."""
+        """
+        Load stat IDs from Trade API. Returns True if loaded successfully.
+
+        With stat IDs already loaded from disk, the request is conditional
+        on the stored ETag and a 304 keeps them as they are.
+        """
         import decky
         decky.logger.info("Loading stat IDs from Trade API...")
 
         url = "https://www.pathofexile.com/api/trade2/data/stats"
 
+        store = Plugin.stat_cache_store
+        store.load()
+        etag = store.get_etag() if Plugin.stat_cache else None
+
         try:
-            req = urllib.request.Request(
+            data, new_etag = await _get_json_if_changed(
                 url,
-                headers={
+                {
                     "User-Agent": "PoE2-Price-Checker-Decky/1.0",
                     "Accept": "application/json"
-                }
+                },
+                15,
+                self.connection_pool,
+                etag
             )
 
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                data = json.loads(response.read().decode())
-
-                new_cache = {}
-                count = 0
-                for group in data.get("result", []):
-                    for entry in group.get("entries", []):
-                        stat_id = entry.get("id", "")
-                        text = entry.get("text", "")
-
-                        if stat_id and text:
-                            import re
-                            normalized = re.sub(r'\d+(?:\.\d+)?', '#', text)
-                            normalized = normalized.replace('+', '').strip().lower()
-                            new_cache[normalized] = stat_id
-                            count += 1
-
-                Plugin.stat_cache = new_cache
-                decky.logger.info(f"Loaded {count} stat IDs from API")
-
-                # Save to disk for next time
-                await Plugin.save_stat_cache_to_disk(self)
+            if data is None:
+                # Not modified: the cache from disk and its index are current
+                decky.logger.info(f"Stat IDs unchanged, using {len(Plugin.stat_cache)} from disk cache")
                 return True
 
+            new_cache = {}
+            count = 0
+            for group in data.get("result", []):
+                for entry in group.get("entries", []):
+                    stat_id = entry.get("id", "")
+                    text = entry.get("text", "")
+
+                    if stat_id and text:
+                        new_cache[_normalize_stat_text(text)] = stat_id
+                        count += 1
+            # Only new_cache is needed; free the parsed payload before indexing
+            del data
+
+            Plugin.stat_cache = new_cache
+            Plugin.stat_index = await _build_stat_index(new_cache)
+            decky.logger.info(f"Loaded {count} stat IDs from API")
+
+            # Save to disk for next time
+            await Plugin.save_stat_cache_to_disk(self, etag=new_etag)
+            return True
+
         except Exception as e:
             decky.logger.error(f"Failed to load stat IDs from API: {e}")
             import traceback
@@ -396,12 +614,7 @@ class Plugin:
         disk_cache_exists = os.path.exists(cache_path)
         disk_cache_time = None
         if disk_cache_exists:
-            try:
-                with open(cache_path, "r") as f:
-                    data = json.load(f)
-                    disk_cache_time = data.get("timestamp")
-            except Exception:
-                pass
+            disk_cache_time = Plugin.stat_cache_store.data.get("timestamp")
 
         return {
             "success": True,
@@ -413,71 +626,35 @@ class Plugin:
 
     def find_stat_id(self, modifier_text: str) -> Optional[str]:
         """Find stat ID for a modifier text"""
-        import re
-        # Normalize the modifier text
-        normalized = re.sub(r'\d+(?:\.\d+)?', '#', modifier_text)
-        normalized = normalized.replace('+', '').strip().lower()
+        normalized = _normalize_stat_text(modifier_text)
 
         # Try exact match
         if normalized in self.stat_cache:
             return self.stat_cache[normalized]
 
-        # Try partial match
-        for pattern, stat_id in self.stat_cache.items():
-            if normalized in pattern or pattern in normalized:
-                return stat_id
-
-        return None
+        # Try partial match: first pattern in cache order that contains
+        # the text or is contained in it. The index is built off the loop
+        # whenever the cache is loaded; until then only exact matches count.
+        index = Plugin.stat_index
+        if index is None or not index.is_current(self.stat_cache):
+            return None
+        pattern = index.find(normalized)
+        return None if pattern is None else self.stat_cache[pattern]
 
     def score_modifier_priority(self, modifier_text: str) -> int:
         """
         Score a modifier's importance for pricing (higher = more valuable).
         Used for selecting top mods in tiered search.
         """
-        text = modifier_text.lower()
-
-        # Tier 1: Most valuable mods (90-100)
-        if "all elemental resist" in text or "all resistance" in text:
-            return 100
-        if "maximum life" in text and "%" in text:
-            return 95
-        if "movement speed" in text:
-            return 90
-
-        # Tier 2: Very valuable (80-89)
-        if "critical" in text and "multiplier" in text:
-            return 85
-        if "level" in text and "skill" in text:
-            return 82
-        if "maximum life" in text:
-            return 80
-
-        # Tier 3: Good mods (65-79)
-        if any(res in text for res in ["fire resist", "cold resist", "lightning resist", "chaos resist"]):
-            return 75
-        if "attack speed" in text:
-            return 70
-        if "cast speed" in text:
-            return 70
-        if "critical" in text and "chance" in text:
-            return 68
-
-        # Tier 4: Decent mods (50-64)
-        if "physical damage" in text:
-            return 62
-        if any(attr in text for attr in ["strength", "dexterity", "intelligence"]):
-            return 55
-        if "mana" in text:
-            return 52
-
-        # Tier 5: Lower priority (30-49)
-        if any(def_ in text for def_ in ["armour", "evasion", "energy shield"]):
-            return 45
-        if "accuracy" in text:
-            return 40
-
-        # Default
-        return 30
+        found: set = set()
+        for match in _MOD_TERM_RE.finditer(modifier_text.lower()):
+            found |= _MOD_TERM_PREFIXES[match.group(1)]
+
+        for groups, score in _MOD_PRIORITY_TABLE:
+            if all(not group.isdisjoint(found) for group in groups):
+                return score
+
+        return _MOD_PRIORITY_DEFAULT
 
     async def load_poe2scout_cache(self) -> None:
         """Load currency rates from poe2scout.com (items loaded on-demand)"""
@@ -489,28 +666,28 @@ class Plugin:
         # Only load leagues to get divine/exalted price ratio
         try:
             leagues_url = "https://poe2scout.com/api/leagues"
-            req = urllib.request.Request(
+            leagues_data = await _get_json(
                 leagues_url,
-                headers={
+                {
                     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
                     "Accept": "application/json"
-                }
+                },
+                15,
+                self.connection_pool
             )
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                leagues_data = json.loads(response.read().decode())
-                for lg in leagues_data:
-                    if lg.get("value") == league:
-                        Plugin.poe2scout_divine_price = lg.get("divinePrice", 100.0)
-                        chaos_divine = lg.get("chaosDivinePrice", 50.0)
-                        # Update currency rates based on poe2scout data
-                        Plugin.currency_rates["divine"] = chaos_divine
-                        Plugin.currency_rates["divine-orb"] = chaos_divine
-                        if Plugin.poe2scout_divine_price > 0:
-                            exalt_rate = chaos_divine / Plugin.poe2scout_divine_price
-                            Plugin.currency_rates["exalted"] = exalt_rate
-                            Plugin.currency_rates["exalted-orb"] = exalt_rate
-                        decky.logger.info(f"poe2scout rates: divine={chaos_divine}c, exalted={exalt_rate:.2f}c")
-                        break
+            for lg in leagues_data:
+                if lg.get("value") == league:
+                    Plugin.poe2scout_divine_price = lg.get("divinePrice", 100.0)
+                    chaos_divine = lg.get("chaosDivinePrice", 50.0)
+                    # Update currency rates based on poe2scout data
+                    Plugin.currency_rates["divine"] = chaos_divine
+                    Plugin.currency_rates["divine-orb"] = chaos_divine
+                    if Plugin.poe2scout_divine_price > 0:
+                        exalt_rate = chaos_divine / Plugin.poe2scout_divine_price
+                        Plugin.currency_rates["exalted"] = exalt_rate
+                        Plugin.currency_rates["exalted-orb"] = exalt_rate
+                    decky.logger.info(f"poe2scout rates: divine={chaos_divine}c, exalted={exalt_rate:.2f}c")
+                    break
         except Exception as e:
             decky.logger.error(f"Failed to load poe2scout rates: {e}")
 
@@ -528,37 +705,71 @@ class Plugin:
         league_encoded = urllib.parse.quote(league, safe='')
         search_encoded = urllib.parse.quote(item_name, safe='')
 
-        # Search all unique categories
+        # Search all unique categories at once, under one rate-limiter slot
+        # for the whole fan-out
         categories = ["weapon", "armour", "accessory", "flask", "jewel"]
 
-        for cat in categories:
-            try:
-                url = f"https://poe2scout.com/api/items/unique/{cat}?league={league_encoded}&search={search_encoded}"
-                req = urllib.request.Request(
-                    url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
-                        "Accept": "application/json"
-                    }
-                )
-                with urllib.request.urlopen(req, timeout=10, context=self.ssl_context) as response:
-                    data = json.loads(response.read().decode())
-                    items = data.get("items", [])
+        await Plugin.poe2scout_limiter.wait()
 
-                    for item in items:
-                        if item.get("name", "").lower() == name_lower:
-                            # Cache it
-                            Plugin.poe2scout_cache["items"][name_lower] = item
-                            decky.logger.info(f"poe2scout found: {item_name} in {cat}")
-                            return item
+        tasks = {
+            asyncio.ensure_future(
+                Plugin._probe_poe2scout_category(self, cat, league_encoded, search_encoded, name_lower)
+            ): cat
+            for cat in categories
+        }
 
-            except Exception as e:
-                decky.logger.warning(f"poe2scout search failed ({cat}): {e}")
-                continue
+        try:
+            # Unique names don't repeat across categories: the first hit is the item
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    cat = tasks.pop(task)
+                    item = task.result()
+                    if item is not None:
+                        # Cache it
+                        Plugin.poe2scout_cache["items"][name_lower] = item
+                        decky.logger.info(f"poe2scout found: {item_name} in {cat}")
+                        return item
+        finally:
+            # Stop waiting on the other categories
+            for task in tasks:
+                task.cancel()
 
         decky.logger.info(f"poe2scout: {item_name} not found")
         return None
 
+    async def _probe_poe2scout_category(
+        self,
+        cat: str,
+        league_encoded: str,
+        search_encoded: str,
+        name_lower: str
+    ) -> Optional[Dict[str, Any]]:
+        """Search one poe2scout unique category for an exact name match"""
+        import decky
+
+        try:
+            url = f"https://poe2scout.com/api/items/unique/{cat}?league={league_encoded}&search={search_encoded}"
+            data = await _get_json(
+                url,
+                {
+                    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+                    "Accept": "application/json"
+                },
+                10,
+                self.connection_pool
+            )
+            items = data.get("items", [])
+
+            for item in items:
+                if item.get("name", "").lower() == name_lower:
+                    return item
+
+        except Exception as e:
+            decky.logger.warning(f"poe2scout search failed ({cat}): {e}")
+
+        return None
+
     async def get_poe2scout_price(self, item_name: str, rarity: str = "Unique") -> Dict[str, Any]:
         """
         Get item price from poe2scout (cache or on-demand fetch).
@@ -784,7 +995,7 @@ class Plugin:
     def _get_history_path(self) -> str:
         """Get path to price history file"""
         import decky
-        return os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "price_history.json")
+        return os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "price_history.jsonl")
 
     async def load_price_history(self) -> None:
         """Load price history from store"""
@@ -799,8 +1010,10 @@ class Plugin:
         Plugin.price_history_store.save()
         decky.logger.info(f"Saved {len(Plugin.price_history)} items to price history")
 
-    def _make_item_key(self, item_name: str, base_type: str, rarity: str) -> str:
-        """Create a unique key for an item based on name/type"""
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _make_item_key(item_name: str, base_type: str, rarity: str) -> str:
+        """Create a unique key for an item based on name/type (cached, items get re-scanned)"""
         # For uniques: use name
         # For rares: use base type
         # This groups similar items together
@@ -823,7 +1036,7 @@ class Plugin:
         """Add a price record to history"""
         import decky
 
-        key = self._make_item_key(item_name, base_type, rarity)
+        key = Plugin._make_item_key(item_name, base_type, rarity)
         timestamp = int(time.time())
 
         record = {
@@ -835,15 +1048,15 @@ class Plugin:
             "base_type": base_type
         }
 
-        if key not in Plugin.price_history:
-            Plugin.price_history[key] = []
+        records = Plugin.price_history.setdefault(key, [])
 
-        # Keep last 100 records per item
-        Plugin.price_history[key].append(record)
-        Plugin.price_history[key] = Plugin.price_history[key][-100:]
+        # Keep last 100 records per item, trimmed in place
+        records.append(record)
+        if len(records) > 100:
+            del records[:len(records) - 100]
 
-        # Save to file
-        await self.save_price_history()
+        # Append one line to the history log instead of rewriting the file
+        Plugin.price_history_store.append_record(key, record)
 
         decky.logger.info(f"Added price record for {key}: {median_price:.1f} {currency} (received currency={currency})")
         return {"success": True}
@@ -855,7 +1068,7 @@ class Plugin:
         rarity: str
     ) -> Dict[str, Any]:
         """Get price history for an item"""
-        key = self._make_item_key(item_name, base_type, rarity)
+        key = Plugin._make_item_key(item_name, base_type, rarity)
 
         records = Plugin.price_history.get(key, [])
 
@@ -880,6 +1093,7 @@ class Plugin:
         """Clear all price history"""
         import decky
         Plugin.price_history = {}
+        Plugin._make_item_key.cache_clear()
         await self.save_price_history()
         decky.logger.info("Price history cleared")
         return {"success": True}
@@ -979,10 +1193,9 @@ class Plugin:
     ) -> Dict[str, Any]:
         """Add a new scan record to history"""
         import decky
-        import uuid
 
-        # Generate unique ID
-        record_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        # Generate unique ID (also names the cached icon file)
+        record_id = Plugin.scan_history_store.next_id()
 
         # Download icon if URL provided
         local_icon_path = None
@@ -1018,30 +1231,10 @@ class Plugin:
             "listingsCount": listings_count
         }
 
-        # Add to beginning of list (newest first)
-        Plugin.scan_history.insert(0, record)
-
-        # Trim to max size and clean up old icons
-        if len(Plugin.scan_history) > Plugin.MAX_SCAN_HISTORY:
-            removed = Plugin.scan_history[Plugin.MAX_SCAN_HISTORY:]
-            Plugin.scan_history = Plugin.scan_history[:Plugin.MAX_SCAN_HISTORY]
-
-            # Clean up icons for removed records
-            for old_record in removed:
-                if old_record.get("localIconPath"):
-                    try:
-                        icon_path = os.path.join(
-                            decky.DECKY_PLUGIN_SETTINGS_DIR,
-                            old_record["localIconPath"]
-                        )
-                        if os.path.exists(icon_path):
-                            os.remove(icon_path)
-                            decky.logger.info(f"Removed old icon: {old_record['localIconPath']}")
-                    except Exception as e:
-                        decky.logger.warning(f"Failed to remove old icon: {e}")
-
-        # Save to file
-        await Plugin.save_scan_history(self)
+        # The store adds it newest first, trims to MAX_SCAN_HISTORY (removing
+        # old icons in the background) and schedules the save
+        Plugin.scan_history_store.data = Plugin.scan_history
+        Plugin.scan_history_store.add_record(record)
 
         decky.logger.info(f"Added scan record: {item_name} ({median_price} {currency})")
         return {"success": True, "id": record_id}
@@ -1062,9 +1255,9 @@ class Plugin:
 
     async def get_scan_record(self, record_id: str) -> Dict[str, Any]:
         """Get a specific scan record by ID"""
-        for record in Plugin.scan_history or []:
-            if record.get("id") == record_id:
-                return {"success": True, "record": record}
+        record = Plugin.scan_history_store.get_record(record_id)
+        if record is not None:
+            return {"success": True, "record": record}
 
         return {"success": False, "error": "Record not found"}
 
@@ -1102,6 +1295,7 @@ class Plugin:
         """Load price learning data from store (handles versioning automatically)"""
         import decky
         Plugin.price_learning = Plugin.price_learning_store.load()
+        Plugin.price_analytics.invalidate_cache()
         total = Plugin.price_learning_store.get_total_count()
         decky.logger.info(f"Loaded price learning data: {total} records")
 
@@ -1111,7 +1305,8 @@ class Plugin:
         Plugin.price_learning_store._data = Plugin.price_learning
         Plugin.price_learning_store._loaded = True
         Plugin.price_learning_store.save()
-        total = sum(len(v) for v in Plugin.price_learning.values() if isinstance(v, list))
+        Plugin.price_analytics.invalidate_cache()
+        total = Plugin.price_learning_store.get_total_count()
         decky.logger.info(f"Saved price learning data: {total} records")
 
     async def add_price_learning_record(
@@ -1170,7 +1365,7 @@ class Plugin:
         import decky
 
         # Normalize item class
-        item_class_key = item_class.lower().replace(" ", "_")
+        item_class_key = PriceLearningStore.class_key(item_class)
 
         # Store price in original currency (no conversion needed)
         record = {
@@ -1181,6 +1376,8 @@ class Plugin:
             "mod_patterns": mod_patterns,
             "price": price,
             "currency": currency,
+            # Exalted equivalent, computed once here instead of on every query
+            "normalized_price": PriceAnalytics.normalize_price(price, currency),
             "search_tier": search_tier,
             "ilvl": ilvl,
             "rarity": rarity,
@@ -1200,18 +1397,11 @@ class Plugin:
             "corrupted": corrupted
         }
 
-        # Add to learning data
-        if item_class_key not in Plugin.price_learning:
-            Plugin.price_learning[item_class_key] = []
-
-        Plugin.price_learning[item_class_key].insert(0, record)
-
-        # Trim to max size
-        if len(Plugin.price_learning[item_class_key]) > Plugin.MAX_LEARNING_RECORDS_PER_CLASS:
-            Plugin.price_learning[item_class_key] = Plugin.price_learning[item_class_key][:Plugin.MAX_LEARNING_RECORDS_PER_CLASS]
-
-        # Save to file
-        await Plugin.save_price_learning(self)
+        # Add to learning data; the store trims, keeps its record count and
+        # schedules the save
+        Plugin.price_learning_store.data = Plugin.price_learning
+        Plugin.price_learning_store.add_record(item_class_key, record)
+        Plugin.price_analytics.invalidate_cache()
 
         decky.logger.info(f"Added price learning: {item_class} @ {quality_score}q = {price:.1f} {currency}")
         return {"success": True}
@@ -1227,7 +1417,7 @@ class Plugin:
         """
         import decky
 
-        item_class_key = item_class.lower().replace(" ", "_")
+        item_class_key = PriceLearningStore.class_key(item_class)
         records = Plugin.price_learning.get(item_class_key, [])
 
         if len(records) < 5:
@@ -1242,6 +1432,8 @@ class Plugin:
 
         # Helper to normalize price to exalted equivalent
         def normalize_price(r):
+            if "normalized_price" in r:
+                return r["normalized_price"]
             raw_price = r.get("price", r.get("price_exalted", 0))
             currency = r.get("currency", r.get("original_currency", "exalted"))
             if currency.lower() in ["divine", "divine-orb", "div"]:
@@ -1284,10 +1476,10 @@ class Plugin:
 
     @staticmethod
     def _get_learning_records_by_class() -> Dict[str, List[Dict[str, Any]]]:
-        """Extract learning records by class, excluding version field"""
+        """Extract learning records by class"""
         result = {}
         for key, value in (Plugin.price_learning or {}).items():
-            if not key.startswith("_") and isinstance(value, list):
+            if isinstance(value, list):
                 result[key] = value
         return result
 
@@ -1318,23 +1510,7 @@ class Plugin:
         Calculate confidence weight for a record.
         Higher weight = more reliable data point.
         """
-        weight = 1.0
-
-        # Search tier weighting (exact match = highest confidence)
-        search_tier = record.get("search_tier", 3)
-        tier_weights = {0: 1.5, 1: 1.2, 2: 0.9, 3: 0.6}
-        weight *= tier_weights.get(search_tier, 0.5)
-
-        # Listings count weighting (more listings = more confidence)
-        listings = record.get("listings_count", 1)
-        if listings >= 10:
-            weight *= 1.3
-        elif listings >= 5:
-            weight *= 1.1
-        elif listings <= 2:
-            weight *= 0.7
-
-        return weight
+        return PriceAnalytics.calculate_confidence_weight(record)
 
     async def get_learning_stats(self) -> Dict[str, Any]:
         """Get learning statistics - delegated to PriceAnalytics"""
@@ -1401,6 +1577,19 @@ class Plugin:
     # OFFICIAL TRADE API
     # =========================================================================
 
+    def _sync_trade_client(self) -> None:
+        """Point the trade client at the league and POESESSID from settings"""
+        # SECURITY NOTE: POESESSID grants account access - never log it
+        self.trade_client.set_league(self.settings.get("league", "Standard"))
+        self.trade_client.set_poesessid(self.settings.get("poesessid", ""))
+
+    @staticmethod
+    def _note_rate_limit_pause(limiter: AdaptiveRateLimiter) -> None:
+        """Show a pause the limiter took from response headers in rate_limit_until"""
+        pause = limiter.pause_remaining()
+        if pause > 0:
+            Plugin.rate_limit_until = max(Plugin.rate_limit_until, time.time() + pause)
+
     async def search_trade_api(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """
         Search the official PoE2 Trade API with adaptive rate limiting.
@@ -1411,122 +1600,19 @@ class Plugin:
         if not self.settings.get("useTradeApi", True):
             return {"success": False, "error": "Trade API disabled in settings"}
 
-        # Use adaptive search limiter
-        await self.search_limiter.wait()
-
         league = self.settings.get("league", "Standard")
-        league_encoded = urllib.parse.quote(league, safe='')
-        base_url = f"https://www.pathofexile.com/api/trade2/search/poe2/{league_encoded}"
-
         decky.logger.info(f"Searching Trade API: {league}")
         decky.logger.info(f"Query: {json.dumps(query, indent=2)}")
 
-        try:
-            # Prepare request
-            data = json.dumps(query).encode("utf-8")
-            req = urllib.request.Request(
-                base_url,
-                data=data,
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                    "Accept": "application/json"
-                },
-                method="POST"
-            )
-
-            # Add POESESSID if configured (SECURITY NOTE: Cookie stored in settings.json)
-            # Warning: POESESSID grants account access - handle with care
-            poesessid = self.settings.get("poesessid", "")
-            if poesessid:
-                req.add_header("Cookie", f"POESESSID={poesessid}")
-                # Don't log the actual session ID for security
-                decky.logger.debug("Using POESESSID for authenticated request")
-
-            with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                # Parse rate limit headers for adaptive limiting
-                headers = {k: v for k, v in response.headers.items()}
-                self.search_limiter.parse_headers(headers)
-                self.search_limiter.handle_success()
+        Plugin._sync_trade_client(self)
+        result = await self.trade_client.search(query)
 
-                result = json.loads(response.read().decode())
-
-                total = result.get("total", 0)
-                result_ids = result.get("result", [])
-                decky.logger.info(f"Trade search: {total} total results, {len(result_ids)} IDs returned")
-
-                return {
-                    "success": True,
-                    "id": result.get("id"),
-                    "total": total,
-                    "result": result_ids,  # All result IDs (API returns max ~100)
-                    "error": None
-                }
-
-        except urllib.error.HTTPError as e:
-            error_body = ""
-            try:
-                error_body = e.read().decode()
-            except Exception:
-                pass
-
-            decky.logger.error(f"Trade API HTTP error: {e.code} - {error_body}")
-
-            if e.code == 429:
-                # Parse Retry-After header and handle with adaptive limiter
-                retry_after = None
-                try:
-                    retry_after = int(e.headers.get('Retry-After', 0))
-                except (ValueError, TypeError):
-                    pass
-                wait_time = self.search_limiter.handle_429(retry_after)
-                Plugin.rate_limit_until = time.time() + wait_time
-                decky.logger.warning(f"Rate limited (429). Backing off for {wait_time:.1f}s until {time.strftime('%H:%M:%S', time.localtime(Plugin.rate_limit_until))}")
-                return {
-                    "success": False,
-                    "error": f"Rate limited. Try again at {time.strftime('%H:%M', time.localtime(Plugin.rate_limit_until))}",
-                    "retry_after": wait_time,
-                    "rate_limited": True
-                }
-
-            if e.code == 400:
-                # Parse error message from response
-                try:
-                    error_json = json.loads(error_body)
-                    error_msg = error_json.get("error", {}).get("message", "Bad request")
-                    if "Unknown item base type" in error_msg:
-                        return {
-                            "success": False,
-                            "error": f"Unknown item type. This item may be currency, a quest item, or not tradeable."
-                        }
-                    return {
-                        "success": False,
-                        "error": f"Trade API: {error_msg}"
-                    }
-                except (json.JSONDecodeError, KeyError, ValueError):
-                    pass  # Error response format not parseable
-
-            return {
-                "success": False,
-                "error": f"Trade API Error {e.code}: {error_body[:100] if error_body else 'Unknown error'}"
-            }
-        except urllib.error.URLError as e:
-            decky.logger.error(f"Trade API connection error: {e}")
-            return {
-                "success": False,
-                "error": "Connection failed. Check your internet connection or try again later."
-            }
-        except Exception as e:
-            decky.logger.error(f"Trade API search error: {e}")
-            error_str = str(e)
-            if "timeout" in error_str.lower():
-                error_str = "Request timed out. Trade API may be slow - try again."
-            elif "SSL" in error_str or "certificate" in error_str.lower():
-                error_str = "SSL/Connection error. Try again in a moment."
-            return {
-                "success": False,
-                "error": error_str
-            }
+        if result.get("rate_limited"):
+            Plugin.rate_limit_until = time.time() + result["retry_after"]
+        elif result["success"]:
+            Plugin._note_rate_limit_pause(self.search_limiter)
+            decky.logger.info(f"Trade search: {result['total']} total results, {len(result['result'])} IDs returned")
+        return result
 
     async def fetch_trade_listings(
         self,
@@ -1546,142 +1632,20 @@ class Plugin:
             return {"success": False, "error": "No results to fetch", "listings": []}
 
         # Apply limit if specified
-        ids_to_fetch = result_ids[:limit] if limit else result_ids
-        total_to_fetch = len(ids_to_fetch)
-
+        total_to_fetch = min(len(result_ids), limit) if limit else len(result_ids)
         decky.logger.info(f"Fetching {total_to_fetch} listings in batches of 10")
 
-        all_listings = []
-        first_item_icon = None  # Extract icon from first item
-        batch_size = 10  # API limit
-
-        poesessid = self.settings.get("poesessid", "")
+        # Batches overlap up to the rate-limit burst the server allows
+        Plugin._sync_trade_client(self)
+        result = await self.trade_client.fetch_listings(result_ids, query_id, limit)
 
-        # Fetch in batches of 10
-        for batch_start in range(0, total_to_fetch, batch_size):
-            batch_ids = ids_to_fetch[batch_start:batch_start + batch_size]
-
-            if not batch_ids:
-                break
-
-            # Use adaptive fetch limiter
-            await self.fetch_limiter.wait()
-
-            ids_param = ",".join(batch_ids)
-            url = f"https://www.pathofexile.com/api/trade2/fetch/{ids_param}?query={query_id}"
-
-            batch_num = (batch_start // batch_size) + 1
-            total_batches = (total_to_fetch + batch_size - 1) // batch_size
-            decky.logger.info(f"Fetching batch {batch_num}/{total_batches} ({len(batch_ids)} items)")
-
-            try:
-                req = urllib.request.Request(
-                    url,
-                    headers={
-                        "User-Agent": "PoE2-Price-Checker-Decky/1.0",
-                        "Accept": "application/json"
-                    }
-                )
+        if result.get("rate_limited"):
+            Plugin.rate_limit_until = time.time() + result["retry_after"]
+        else:
+            Plugin._note_rate_limit_pause(self.fetch_limiter)
 
-                # SECURITY: Don't log POESESSID - grants account access
-                if poesessid:
-                    req.add_header("Cookie", f"POESESSID={poesessid}")
-
-                with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                    # Parse rate limit headers for adaptive limiting
-                    headers = {k: v for k, v in response.headers.items()}
-                    self.fetch_limiter.parse_headers(headers)
-                    self.fetch_limiter.handle_success()
-
-                    result = json.loads(response.read().decode())
-
-                    for item in result.get("result", []):
-                        if not item:
-                            continue
-
-                        # Extract icon from first item
-                        if first_item_icon is None:
-                            item_data = item.get("item", {})
-                            first_item_icon = item_data.get("icon")
-
-                        listing = item.get("listing", {})
-                        price = listing.get("price", {})
-                        amount = price.get("amount")
-                        currency = price.get("currency")
-                        account_data = listing.get("account", {})
-                        account = account_data.get("name", "Unknown")
-
-                        # Extract character name for /hideout command
-                        character = account_data.get("lastCharacterName", "")
-
-                        # Extract online status
-                        online_data = account_data.get("online")
-                        online_status = None
-                        if online_data:
-                            online_status = online_data.get("status") if isinstance(online_data, dict) else online_data
-
-                        all_listings.append({
-                            "amount": amount,
-                            "currency": currency,
-                            "account": account,
-                            "character": character,
-                            "online": online_status,
-                            "whisper": listing.get("whisper", ""),
-                            "indexed": listing.get("indexed", ""),
-                        })
-
-            except urllib.error.HTTPError as e:
-                decky.logger.error(f"Trade API fetch error (batch {batch_num}): {e.code}")
-                if e.code == 429:
-                    # Handle rate limit with adaptive backoff
-                    retry_after = None
-                    try:
-                        retry_after = int(e.headers.get('Retry-After', 0))
-                    except (ValueError, TypeError):
-                        pass
-                    wait_time = self.fetch_limiter.handle_429(retry_after)
-                    Plugin.rate_limit_until = time.time() + wait_time
-                    decky.logger.warning(f"Fetch rate limited (429). Backing off for {wait_time:.1f}s until {time.strftime('%H:%M:%S', time.localtime(Plugin.rate_limit_until))}")
-                    # Wait and retry this batch once
-                    await asyncio.sleep(wait_time)
-                    # Retry this batch
-                    try:
-                        await self.fetch_limiter.wait()
-                        with urllib.request.urlopen(req, timeout=15, context=self.ssl_context) as response:
-                            result = json.loads(response.read().decode())
-                            for item in result.get("result", []):
-                                if not item:
-                                    continue
-                                if first_item_icon is None:
-                                    first_item_icon = item.get("item", {}).get("icon")
-                                listing = item.get("listing", {})
-                                price = listing.get("price", {})
-                                account_data = listing.get("account", {})
-                                # Extract character name for /hideout command
-                                character = account_data.get("lastCharacterName", "")
-                                # Extract online status
-                                online_data = account_data.get("online")
-                                online_status = None
-                                if online_data:
-                                    online_status = online_data.get("status") if isinstance(online_data, dict) else online_data
-                                all_listings.append({
-                                    "amount": price.get("amount"),
-                                    "currency": price.get("currency"),
-                                    "account": account_data.get("name", "Unknown"),
-                                    "character": character,
-                                    "online": online_status,
-                                    "whisper": listing.get("whisper", ""),
-                                    "indexed": listing.get("indexed", ""),
-                                })
-                            self.fetch_limiter.handle_success()
-                    except Exception as retry_e:
-                        decky.logger.error(f"Retry failed: {retry_e}")
-                else:
-                    # Continue with other batches if one fails
-                    continue
-            except Exception as e:
-                decky.logger.error(f"Trade API fetch error (batch {batch_num}): {e}")
-                continue
+        all_listings = [listing.to_dict() for listing in result["listings"]]
+        first_item_icon = result["icon"]
 
         decky.logger.info(f"Total fetched: {len(all_listings)} listings")
 
@@ -2093,8 +2057,9 @@ class Plugin:
             "error": None
         }
 
-        # Check cache first
-        cached = self.search_cache.get(item_name, base_type, rarity, modifiers)
+        # Check cache first (key is built once and reused for the put below)
+        cache_key = self.search_cache.make_key(item_name, base_type, rarity, modifiers)
+        cached = self.search_cache.get_cached(cache_key)
         if cached:
             decky.logger.info("Using cached search result")
             result["tiers"] = cached.result.get("tiers", [])
@@ -2104,6 +2069,13 @@ class Plugin:
             result["from_cache"] = True
             return result
 
+        # Same search found nothing moments ago, skip the Trade API round-trips
+        if self.search_cache.is_known_miss(cache_key):
+            decky.logger.info("Known miss, skipping search")
+            result["error"] = Plugin._no_results_error(rarity)
+            result["from_cache"] = True
+            return result
+
         # Tier names and descriptions
         tier_info = {
             0: {"name": "Exact Match", "description": "All mods, 100% values"},
@@ -2241,22 +2213,31 @@ class Plugin:
 
         # If no tiers found anything, provide helpful error message
         if not result["tiers"]:
-            if rarity == "Unique":
-                result["error"] = "No listings found for this unique item. It may be very rare or not commonly traded."
-            elif rarity == "Gem":
-                result["error"] = "No gem listings found. Try searching with different level/quality settings."
-            elif rarity == "Currency":
-                result["error"] = "Currency not found on trade. Use poe2scout or check in-game currency exchange."
-            else:
-                result["error"] = "No similar items found. Try disabling some modifier filters or checking if this item type is tradeable."
+            result["error"] = Plugin._no_results_error(rarity)
+
+        # Searches ran but nothing is listed: remember it briefly
+        # (failed or rate-limited searches leave no tiers and are not marked)
+        if result["tiers"] and total_found == 0 and not result["poe2scout_price"]:
+            self.search_cache.mark_miss(cache_key)
 
         # Cache the result (even if empty, to avoid repeated failed searches)
         if result["tiers"] or result["poe2scout_price"]:
-            self.search_cache.put(item_name, base_type, rarity, modifiers, result)
+            self.search_cache.put_cached(cache_key, result)
 
         decky.logger.info(f"Progressive search complete: {len(result['tiers'])} tiers, {result['total_searches']} searches")
         return result
 
+    @staticmethod
+    def _no_results_error(rarity: str) -> str:
+        """User-facing message for a search that found no listings"""
+        if rarity == "Unique":
+            return "No listings found for this unique item. It may be very rare or not commonly traded."
+        elif rarity == "Gem":
+            return "No gem listings found. Try searching with different level/quality settings."
+        elif rarity == "Currency":
+            return "Currency not found on trade. Use poe2scout or check in-game currency exchange."
+        return "No similar items found. Try disabling some modifier filters or checking if this item type is tradeable."
+
     # =========================================================================
     # SETTINGS MANAGEMENT
     # =========================================================================
@@ -2271,14 +2252,20 @@ class Plugin:
         """Check if we're currently rate limited"""
         import time
         now = time.time()
+        # Current pacing of each limiter, as tuned from headers and latency
+        limiters = {
+            "search": Plugin.search_limiter.status() if Plugin.search_limiter else None,
+            "fetch": Plugin.fetch_limiter.status() if Plugin.fetch_limiter else None
+        }
         if Plugin.rate_limit_until > now:
             remaining = int(Plugin.rate_limit_until - now)
             return {
                 "rate_limited": True,
                 "remaining_seconds": remaining,
-                "until": time.strftime('%H:%M', time.localtime(Plugin.rate_limit_until))
+                "until": time.strftime('%H:%M', time.localtime(Plugin.rate_limit_until)),
+                "limiters": limiters
             }
-        return {"rate_limited": False}
+        return {"rate_limited": False, "limiters": limiters}
 
     async def get_settings(self) -> Dict[str, Any]:
         """Return current settings"""
@@ -2289,7 +2276,6 @@ class Plugin:
     async def get_modifier_tier_data(self) -> Dict[str, Any]:
         """Load and return modifier tier data from JSON file"""
         import decky
-        import json
 
         try:
             tier_data_path = os.path.join(os.path.dirname(__file__), "data", "modifier_tiers.json")
@@ -2298,8 +2284,7 @@ class Plugin:
                 decky.logger.warning(f"Tier data file not found: {tier_data_path}")
                 return {"success": False, "error": "Tier data file not found"}
 
-            with open(tier_data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = await _aread_json(tier_data_path)
 
             decky.logger.info(f"Loaded tier data: {len(data.get('modifiers', []))} modifiers")
             return {"success": True, "data": data}
@@ -2367,7 +2352,6 @@ class Plugin:
             # Save settings inline
             try:
                 settings_path = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "settings.json")
-                os.makedirs(os.path.dirname(settings_path), exist_ok=True)
 
                 # SECURITY: Create a copy for saving that excludes empty poesessid
                 # to avoid creating the field in settings.json unnecessarily
@@ -2375,8 +2359,7 @@ class Plugin:
                 if not settings_to_save.get("poesessid"):
                     settings_to_save.pop("poesessid", None)
 
-                with open(settings_path, "w") as f:
-                    json.dump(settings_to_save, f, indent=2)
+                await _awrite_json(settings_path, settings_to_save)
             except Exception as e:
                 decky.logger.error(f"Failed to save settings: {e}")
                 return {"success": False, "error": f"Failed to save: {e}"}